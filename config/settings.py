@@ -5,6 +5,7 @@ class Settings:
     def __init__(self):
         self.config_file = "config/hmi_config.json"
         self.default_config = {
+            "zones": [1, 2, 3, 4],
             "serial": {
                 "ports": {
                     "zone_1": "COM3",
@@ -13,7 +14,22 @@ class Settings:
                     "zone_4": "COM6"
                 },
                 "baudrate": 115200,
-                "timeout": 1.0
+                "timeout": 1.0,
+                "engine": "threaded",
+                "max_line_bytes": 4096,
+                "protocols": {}
+            },
+            "simulator": {
+                "enabled": False,
+                "transport": "pty",
+                "protocol": "json",
+                "rate_hz": 1.0,
+                "multiplex": False,
+                "burst_every": 0.0,
+                "burst_size": 50,
+                "malformed_rate": 0.0,
+                "disconnect_every": 0.0,
+                "base_port": 7000
             },
             "calibration": {
                 "zone_1": {
@@ -37,15 +53,44 @@ class Settings:
                     "tare": 0.0
                 }
             },
+            "equilibrium": {
+                "zone_1": {
+                    "stability_threshold": 0.1,
+                    "window_minutes": 30
+                },
+                "zone_2": {
+                    "stability_threshold": 0.1,
+                    "window_minutes": 30
+                },
+                "zone_3": {
+                    "stability_threshold": 0.1,
+                    "window_minutes": 30
+                },
+                "zone_4": {
+                    "stability_threshold": 0.1,
+                    "window_minutes": 30
+                }
+            },
             "ui": {
                 "fullscreen": True,
                 "width": 1280,
                 "height": 720,
-                "touch_button_height": 80
+                "touch_button_height": 80,
+                "startup_budget_seconds": 3.0,
+                "max_update_hz": 5,
+                "stats_report_seconds": 300
             },
             "logging": {
+                "backend": "csv",
+                "sqlite_file": "history.db",
                 "interval_seconds": 10,
-                "max_log_days": 30
+                "max_log_days": 30,
+                "maintenance_hours": 6,
+                "buffer_hours": 24,
+                "history_max_points": 3000,
+                "rollup_tiers": [60, 600, 3600],
+                "flush_rows": 50,
+                "flush_seconds": 5.0
             }
         }
         self.config = self.load_config()
@@ -54,8 +99,9 @@ class Settings:
         try:
             with open(self.config_file, 'r') as f:
                 config = json.load(f)
-                # Ensure all 4 zones have calibration data
-                for zone_id in range(1, 5):
+                # Ensure every configured zone has calibration data
+                zone_ids = self._parse_zone_ids(config.get("zones", self.default_config["zones"]))
+                for zone_id in zone_ids:
                     zone_key = f"zone_{zone_id}"
                     if zone_key not in config.get("calibration", {}):
                         if "calibration" not in config:
@@ -77,6 +123,15 @@ class Settings:
         with open(self.config_file, 'w') as f:
             json.dump(config, f, indent=4)
     
+    def _parse_zone_ids(self, zones):
+        # "zones" is either a zone count or an explicit list of zone IDs
+        if isinstance(zones, int):
+            return list(range(1, zones + 1))
+        return sorted({int(zone_id) for zone_id in zones})
+    
+    def get_zone_ids(self):
+        return self._parse_zone_ids(self.config.get("zones", self.default_config["zones"]))
+    
     def get_mass_calibration(self, zone):
         return self.config["calibration"].get(f"zone_{zone}", {
             "mass_offset": 0,
@@ -98,6 +153,45 @@ class Settings:
         
         self.save_config()
     
+    def get_equilibrium_config(self, zone):
+        equilibrium_config = {"stability_threshold": 0.1, "window_minutes": 30}
+        equilibrium_config.update(self.config.get("equilibrium", {}).get(f"zone_{zone}", {}))
+        return equilibrium_config
+    
+    def update_equilibrium_config(self, zone, stability_threshold=None, window_minutes=None):
+        zone_key = f"zone_{zone}"
+        if "equilibrium" not in self.config:
+            self.config["equilibrium"] = {}
+        if zone_key not in self.config["equilibrium"]:
+            self.config["equilibrium"][zone_key] = self.get_equilibrium_config(zone)
+        
+        if stability_threshold is not None:
+            self.config["equilibrium"][zone_key]["stability_threshold"] = stability_threshold
+        if window_minutes is not None:
+            self.config["equilibrium"][zone_key]["window_minutes"] = window_minutes
+        
+        self.save_config()
+    
+    def get_ui_config(self):
+        ui_config = dict(self.default_config["ui"])
+        ui_config.update(self.config.get("ui", {}))
+        return ui_config
+    
+    def get_serial_config(self):
+        serial_config = dict(self.default_config["serial"])
+        serial_config.update(self.config.get("serial", {}))
+        return serial_config
+    
+    def get_simulator_config(self):
+        simulator_config = dict(self.default_config["simulator"])
+        simulator_config.update(self.config.get("simulator", {}))
+        return simulator_config
+    
+    def get_logging_config(self):
+        logging_config = dict(self.default_config["logging"])
+        logging_config.update(self.config.get("logging", {}))
+        return logging_config
+    
     def get_serial_port(self, zone):
         zone_key = f"zone_{zone}"
         
@@ -111,17 +205,23 @@ class Settings:
             else:
                 return f"COM{zone+2}"
     
+    def get_serial_protocol(self, port):
+        # Per-port wire format: "json" lines (default) or "binary" frames
+        return self.get_serial_config()["protocols"].get(port, "json")
+    
+    def update_serial_protocol(self, port, protocol):
+        self.config["serial"].setdefault("protocols", {})[port] = protocol
+        self.save_config()
+    
     def update_serial_port(self, zone, port):
         zone_key = f"zone_{zone}"
         if "ports" not in self.config["serial"]:
             # Migrate from old format to new format
             old_port = self.config["serial"].get("port", "COM3")
             self.config["serial"]["ports"] = {
-                "zone_1": old_port,
-                "zone_2": "COM4",
-                "zone_3": "COM5", 
-                "zone_4": "COM6"
+                f"zone_{zone_id}": f"COM{zone_id+2}" for zone_id in self.get_zone_ids()
             }
+            self.config["serial"]["ports"]["zone_1"] = old_port
             # Remove old port key if it exists
             if "port" in self.config["serial"]:
                 del self.config["serial"]["port"]
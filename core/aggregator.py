@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, Optional
+from core.sample import Sample
+
+AGGREGATED_FIELDS = ['temp', 'hum', 'calibrated_mass']
+
+AGGREGATED_FIELDNAMES = [
+    'timestamp', 'zone', 'temp', 'hum', 'mass', 'calibrated_mass',
+    'temp_min', 'temp_max', 'hum_min', 'hum_max',
+    'calibrated_mass_min', 'calibrated_mass_max', 'count'
+]
+
+class IntervalAggregator:
+    def __init__(self, zone: int, interval_seconds: float):
+        self.zone = zone
+        self.interval_seconds = interval_seconds
+        self.bucket_start: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.sums: Dict[str, float] = {field: 0.0 for field in AGGREGATED_FIELDS + ['mass']}
+        self.mins: Dict[str, float] = {}
+        self.maxs: Dict[str, float] = {}
+
+    def _bucket_for(self, timestamp: float) -> float:
+        if self.interval_seconds <= 0:
+            return timestamp
+        return timestamp - (timestamp % self.interval_seconds)
+
+    def add(self, sample: Sample, timestamp: float) -> Optional[Dict[str, Any]]:
+        bucket = self._bucket_for(timestamp)
+        record = None
+        if self.bucket_start is not None and bucket != self.bucket_start:
+            record = self.flush()
+
+        if self.count == 0:
+            self.bucket_start = bucket
+
+        self.count += 1
+        self.sums['mass'] += sample.mass
+        for field in AGGREGATED_FIELDS:
+            value = getattr(sample, field)
+            self.sums[field] += value
+            if self.count == 1 or value < self.mins[field]:
+                self.mins[field] = value
+            if self.count == 1 or value > self.maxs[field]:
+                self.maxs[field] = value
+
+        if self.interval_seconds <= 0:
+            record = self.flush()
+
+        return record
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        if self.count == 0:
+            return None
+
+        record = {
+            'timestamp': datetime.fromtimestamp(self.bucket_start).astimezone().isoformat(),
+            'ts': self.bucket_start,
+            'zone': self.zone,
+            'mass': self.sums['mass'] / self.count,
+            'count': self.count
+        }
+        for field in AGGREGATED_FIELDS:
+            record[field] = self.sums[field] / self.count
+            record[f'{field}_min'] = self.mins[field]
+            record[f'{field}_max'] = self.maxs[field]
+
+        self.bucket_start = None
+        self._reset()
+        return record
+
+class _MergedBucket:
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+        self.count = 0.0
+        self.sums: Dict[str, float] = {}
+        self.weights: Dict[str, float] = {}
+        self.mins: Dict[str, float] = {}
+        self.maxs: Dict[str, float] = {}
+
+    def add(self, row: Dict[str, float]):
+        weight = row.get('count') or 1.0
+        self.count += weight
+        for field in AGGREGATED_FIELDS + ['mass']:
+            value = row.get(field)
+            if value is None:
+                continue
+            self.sums[field] = self.sums.get(field, 0.0) + value * weight
+            self.weights[field] = self.weights.get(field, 0.0) + weight
+            if field in AGGREGATED_FIELDS:
+                low = row.get(f'{field}_min', value)
+                high = row.get(f'{field}_max', value)
+                self.mins[field] = min(self.mins.get(field, low), low)
+                self.maxs[field] = max(self.maxs.get(field, high), high)
+
+    def record(self) -> Dict[str, float]:
+        record = {'timestamp': self.timestamp, 'count': self.count}
+        for field, total in self.sums.items():
+            record[field] = total / self.weights[field]
+        for field in self.mins:
+            record[f'{field}_min'] = self.mins[field]
+            record[f'{field}_max'] = self.maxs[field]
+        return record
+
+def merge_buckets(rows: Iterable[Dict[str, float]], bucket_seconds: float) -> Iterator[Dict[str, float]]:
+    # Folds time-ordered rows, raw or already aggregated, into coarser buckets
+    # as they stream past, so only one bucket is held at a time
+    key = None
+    bucket: Optional[_MergedBucket] = None
+    for row in rows:
+        row_key = row['timestamp'] // bucket_seconds
+        if row_key != key:
+            if bucket:
+                yield bucket.record()
+            key, bucket = row_key, _MergedBucket(row['timestamp'])
+        bucket.add(row)
+    if bucket:
+        yield bucket.record()
@@ -0,0 +1,167 @@
+import glob
+import gzip
+import os
+import re
+import struct
+import time
+from typing import Dict, Any, Iterator, List, Optional
+import numpy as np
+from core.day_file_storage import DayFileStorage
+from core.csv_storage import CsvStorage
+from core.aggregator import AGGREGATED_FIELDS
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('temp', '<f4'),
+    ('hum', '<f4'),
+    ('mass', '<f4'),
+    ('calibrated_mass', '<f4')
+])
+
+RECORD_STRUCT = struct.Struct('<dffff')
+
+def _bucket_series(series: Dict[str, np.ndarray], bucket_seconds: float) -> Dict[str, np.ndarray]:
+    # The same buckets SqliteStorage.read_buckets returns: first timestamp,
+    # sample count, mean and extremes of every bucket_seconds-wide slot
+    keys = np.floor_divide(series['timestamp'], bucket_seconds)
+    starts = np.flatnonzero(np.diff(keys, prepend=np.nan) != 0)
+    counts = np.diff(starts, append=len(keys)).astype(np.float64)
+
+    result = {'timestamp': series['timestamp'][starts], 'count': counts}
+    for name in ('temp', 'hum', 'mass', 'calibrated_mass'):
+        result[name] = np.add.reduceat(series[name], starts) / counts
+    for field in AGGREGATED_FIELDS:
+        values = series[field]
+        result[f'{field}_min'] = np.minimum.reduceat(values, starts)
+        result[f'{field}_max'] = np.maximum.reduceat(values, starts)
+    return result
+
+class _BinaryDayFile:
+    def __init__(self, path: str):
+        self.path = path
+        self.rows: List[Dict[str, Any]] = []
+        self.last_flush = time.monotonic()
+
+        # Drop a trailing partial record left behind by a crash mid-write
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size % RECORD_STRUCT.size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size - size % RECORD_STRUCT.size)
+
+        self.file = open(path, 'ab')
+
+    def flush(self):
+        if self.rows:
+            self.file.write(b''.join(
+                RECORD_STRUCT.pack(
+                    row['ts'],
+                    row.get('temp', 0.0),
+                    row.get('hum', 0.0),
+                    row.get('mass', 0.0),
+                    row.get('calibrated_mass', 0.0)
+                ) for row in self.rows
+            ))
+            self.rows = []
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class BinaryStorage(DayFileStorage):
+    file_extension = ".bin"
+
+    def _open_day_file(self, path: str) -> _BinaryDayFile:
+        return _BinaryDayFile(path)
+
+    def read_day_array(self, zone: int, date_str: str) -> np.ndarray:
+        path = self.day_file_path(zone, date_str)
+        if not os.path.exists(path):
+            if os.path.exists(path + ".gz"):
+                with gzip.open(path + ".gz", 'rb') as f:
+                    data = f.read()
+                data = data[:len(data) - len(data) % RECORD_DTYPE.itemsize]
+                return np.frombuffer(data, dtype=RECORD_DTYPE)
+            return np.empty(0, dtype=RECORD_DTYPE)
+        self.flush(zone)
+
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def read_array(self, zone: int, date_str: str, start_ts: Optional[float] = None,
+                   end_ts: Optional[float] = None) -> np.ndarray:
+        records = self.read_day_array(zone, date_str)
+        timestamps = records['timestamp']
+        first = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, side='left')
+        last = len(records) if end_ts is None else np.searchsorted(timestamps, end_ts, side='left')
+        return records[first:last]
+
+    def read_series(self, zone: int, start_ts: float, end_ts: float,
+                    bucket_seconds: Optional[float] = None) -> Dict[str, np.ndarray]:
+        # Column arrays straight from the memmapped day files, for callers
+        # that work on whole columns (the chart path)
+        parts = [self.read_array(zone, date_str, start_ts, end_ts)
+                 for date_str in self.day_strs(start_ts, end_ts)]
+        series = {name: np.concatenate([part[name] for part in parts], dtype=np.float64)
+                  for name in RECORD_DTYPE.names}
+        return _bucket_series(series, bucket_seconds) if bucket_seconds else series
+
+    def read_buckets(self, zone: int, start_ts: float, end_ts: float,
+                     bucket_seconds: float) -> Iterator[Dict[str, float]]:
+        series = self.read_series(zone, start_ts, end_ts, bucket_seconds)
+        names = list(series)
+        for values in zip(*(series[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+    def read_range(self, zone: int, date_str: str, start_ts: Optional[float] = None,
+                   end_ts: Optional[float] = None) -> Iterator[Dict[str, float]]:
+        records = self.read_array(zone, date_str, start_ts, end_ts)
+        fields = records.dtype.names
+        for values in records.tolist():
+            yield dict(zip(fields, values))
+
+def convert_csv_logs(data_dir: str, remove_csv: bool = False) -> int:
+    csv_storage = CsvStorage(data_dir)
+    binary_storage = BinaryStorage(data_dir)
+    converted = 0
+
+    try:
+        for path in sorted(glob.glob(os.path.join(data_dir, "zone_*_*.csv"))):
+            match = re.match(r"zone_(\d+)_(\d{8})\.csv$", os.path.basename(path))
+            if not match:
+                continue
+            zone, date_str = int(match.group(1)), match.group(2)
+
+            bin_path = binary_storage.day_file_path(zone, date_str)
+            if os.path.exists(bin_path):
+                print(f"Skipping {path}: {bin_path} already exists")
+                continue
+
+            rows = []
+            for row in csv_storage.read_range(zone, date_str):
+                row['ts'] = row['timestamp']
+                rows.append(row)
+            rows.sort(key=lambda row: row['ts'])
+
+            day_file = binary_storage._open_day_file(bin_path)
+            day_file.rows = rows
+            day_file.close()
+            converted += 1
+
+            if remove_csv:
+                os.remove(path)
+            print(f"Converted {path} ({len(rows)} rows)")
+    finally:
+        csv_storage.close()
+        binary_storage.close()
+
+    return converted
+
+if __name__ == "__main__":
+    import sys
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data/logs"
+    print(f"Converted {convert_csv_logs(data_dir)} day files in {data_dir}")
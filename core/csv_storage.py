@@ -0,0 +1,145 @@
+import csv
+import gzip
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional
+from core.day_file_storage import DayFileStorage
+
+LOG_FIELDNAMES = ['timestamp', 'zone', 'temp', 'hum', 'mass', 'calibrated_mass']
+
+def parse_row(row: Dict[str, str]) -> Optional[Dict[str, float]]:
+    try:
+        # Logs written before the epoch column only have the ISO string
+        ts = row.get('ts')
+        timestamp = float(ts) if ts else datetime.fromisoformat(row['timestamp']).timestamp()
+        parsed = {'timestamp': timestamp}
+        for key, value in row.items():
+            if key not in ('timestamp', 'ts', 'zone') and value not in (None, ''):
+                parsed[key] = float(value)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return parsed
+
+def _line_timestamp(line: bytes) -> Optional[float]:
+    field = line.split(b',', 1)[0]
+    try:
+        return float(field)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(field.decode('ascii')).timestamp()
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+def seek_to_timestamp(f, start_ts: float, block_size: int = 4096):
+    # Rows are appended in time order, so bisect over byte offsets to land
+    # just before the first row at or after start_ts, then scan forward
+    data_start = f.tell()
+    low = data_start
+    high = f.seek(0, os.SEEK_END)
+
+    while high - low > block_size:
+        mid = (low + high) // 2
+        f.seek(mid)
+        f.readline()
+        timestamp = None
+        while timestamp is None:
+            line = f.readline()
+            if not line:
+                break
+            timestamp = _line_timestamp(line)
+        if timestamp is None or timestamp >= start_ts:
+            high = mid
+        else:
+            low = mid
+
+    f.seek(low)
+    if low != data_start:
+        f.readline()
+
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line:
+            break
+        timestamp = _line_timestamp(line)
+        if timestamp is not None and timestamp >= start_ts:
+            f.seek(position)
+            break
+
+class _CsvDayFile:
+    def __init__(self, path: str, fieldnames: List[str]):
+        self.path = path
+        self.rows: List[Dict[str, Any]] = []
+        self.last_flush = time.monotonic()
+
+        existing_fieldnames = self._read_header(path)
+        self.file = open(path, 'a', newline='')
+        if existing_fieldnames:
+            fieldnames = existing_fieldnames
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction='ignore')
+        if not existing_fieldnames:
+            self.writer.writeheader()
+            self.file.flush()
+
+    @staticmethod
+    def _read_header(path: str) -> Optional[List[str]]:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, 'r', newline='') as f:
+            header = f.readline().strip()
+        return header.split(',') if header else None
+
+    def flush(self):
+        if self.rows:
+            self.writer.writerows(self.rows)
+            self.rows = []
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class CsvStorage(DayFileStorage):
+    file_extension = ".csv"
+
+    def __init__(self, data_dir: str, fieldnames: List[str] = None,
+                 flush_rows: int = 50, flush_seconds: float = 5.0):
+        # Every row leads with its epoch time, so reads and seeks compare
+        # numbers and a repeated DST hour cannot reorder the file
+        self.fieldnames = ['ts'] + [name for name in fieldnames or LOG_FIELDNAMES if name != 'ts']
+        super().__init__(data_dir, flush_rows=flush_rows, flush_seconds=flush_seconds)
+
+    def _open_day_file(self, path: str) -> _CsvDayFile:
+        return _CsvDayFile(path, self.fieldnames)
+
+    def read_range(self, zone: int, date_str: str, start_ts: Optional[float] = None,
+                   end_ts: Optional[float] = None) -> Iterator[Dict[str, float]]:
+        path = self.day_file_path(zone, date_str)
+        compressed = not os.path.exists(path)
+        if compressed:
+            path += ".gz"
+            if not os.path.exists(path):
+                return
+        self.flush(zone)
+        with (gzip.open(path, 'rb') if compressed else open(path, 'rb')) as f:
+            header = f.readline().decode('ascii').strip().split(',')
+            # Seeking inside a gzip stream means decompressing up to the
+            # target anyway, so archived days are filtered while streaming
+            if start_ts is not None and not compressed:
+                seek_to_timestamp(f, start_ts)
+            for line in f:
+                try:
+                    values = line.decode('utf-8').rstrip('\r\n').split(',')
+                except UnicodeDecodeError:
+                    continue
+                parsed = parse_row(dict(zip(header, values)))
+                if parsed is None:
+                    continue
+                if start_ts is not None and parsed['timestamp'] < start_ts:
+                    continue
+                if end_ts is not None and parsed['timestamp'] >= end_ts:
+                    break
+                yield parsed
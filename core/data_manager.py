@@ -1,19 +1,101 @@
-import json
 import csv
 import os
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Iterator, List, Optional
+import numpy as np
 from config.settings import Settings
+from core.csv_storage import CsvStorage
+from core.aggregator import IntervalAggregator, AGGREGATED_FIELDNAMES, merge_buckets
+from core.ring_buffer import SampleRingBuffer
+from core.equilibrium import EquilibriumDetector
+from core.retention import RetentionWorker
+from core.rollup import RollupStore
+from core.sample import Sample
+from core.timebase import Timebase
+from core.gap_tracker import GapTracker, GAP_FIELDNAMES
+
+BUFFER_FIELDS = ['temp', 'hum', 'mass', 'calibrated_mass', 'calibrated_mass_min', 'calibrated_mass_max']
 
 class DataManager:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, timebase: Optional[Timebase] = None):
         self.settings = settings
+        self.timebase = timebase or Timebase()
         self.data_dir = "data/logs"
         self.ensure_data_directory()
         
+        logging_config = self.settings.get_logging_config()
+        self.log_interval = logging_config["interval_seconds"]
+        self.aggregators: Dict[int, IntervalAggregator] = {}
+        self.gap_trackers: Dict[int, GapTracker] = {}
+        self.history_max_points = logging_config["history_max_points"]
+        self.buffer_hours = logging_config["buffer_hours"]
+        self.buffer_capacity = int(self.buffer_hours * 3600 / max(self.log_interval, 1))
+        self.buffers: Dict[int, SampleRingBuffer] = {}
+        self.buffers_lock = threading.Lock()
+        self.detectors: Dict[int, EquilibriumDetector] = {}
+        self.detectors_lock = threading.Lock()
+        self.equilibrium_states: Dict[int, bool] = {}
+        self.equilibrium_callback: Optional[Callable] = None
+        self.storage = self._create_storage(logging_config)
+        # Backends that bucket history themselves need no rollup files
+        self.rollups = RollupStore(
+            os.path.join(self.data_dir, "rollups"),
+            [] if hasattr(self.storage, "read_buckets") else logging_config["rollup_tiers"],
+            flush_rows=logging_config["flush_rows"],
+            flush_seconds=logging_config["flush_seconds"]
+        )
+        self.gap_storage = self._create_gap_storage(logging_config)
+        self.retention_worker = RetentionWorker(
+            [self.storage, self.rollups, self.gap_storage],
+            max_log_days=logging_config["max_log_days"],
+            interval_hours=logging_config["maintenance_hours"]
+        )
+        self.retention_worker.start()
+        
     def ensure_data_directory(self):
         os.makedirs(self.data_dir, exist_ok=True)
     
+    def _create_storage(self, logging_config: Dict[str, Any]):
+        backend = logging_config["backend"]
+        if backend == "sqlite":
+            from core.sqlite_storage import SqliteStorage
+            return SqliteStorage(
+                os.path.join(self.data_dir, logging_config["sqlite_file"]),
+                flush_rows=logging_config["flush_rows"],
+                flush_seconds=logging_config["flush_seconds"]
+            )
+        
+        if backend == "binary":
+            from core.binary_storage import BinaryStorage
+            return BinaryStorage(
+                self.data_dir,
+                flush_rows=logging_config["flush_rows"],
+                flush_seconds=logging_config["flush_seconds"]
+            )
+        
+        if backend != "csv":
+            print(f"Unknown logging backend '{backend}', falling back to csv")
+        return CsvStorage(
+            self.data_dir,
+            fieldnames=AGGREGATED_FIELDNAMES,
+            flush_rows=logging_config["flush_rows"],
+            flush_seconds=logging_config["flush_seconds"]
+        )
+    
+    def _create_gap_storage(self, logging_config: Dict[str, Any]):
+        # Gap records are kept next to the samples they describe
+        if logging_config["backend"] == "sqlite":
+            from core.sqlite_storage import SqliteGapStorage
+            return SqliteGapStorage(os.path.join(self.data_dir, logging_config["sqlite_file"]))
+        
+        return CsvStorage(
+            os.path.join(self.data_dir, "gaps"),
+            fieldnames=GAP_FIELDNAMES,
+            flush_rows=1,
+            flush_seconds=logging_config["flush_seconds"]
+        )
+    
     def calibrate_mass(self, raw_mass: float, zone: int) -> float:
         cal = self.settings.get_mass_calibration(zone)
         offset = cal.get("mass_offset", 0)
@@ -23,77 +105,263 @@ class DataManager:
         actual_mass = (raw_mass - offset) * scale - tare
         return max(0.0, actual_mass)
     
-    def process_sensor_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
-        processed_data = raw_data.copy()
-        processed_data["timestamp"] = datetime.now().isoformat()
-        
-        zone = raw_data.get("zone", 1)
-        raw_mass = raw_data.get("mass", 0)
-        processed_data["calibrated_mass"] = self.calibrate_mass(raw_mass, zone)
-        
-        return processed_data
+    def process_sensor_data(self, sample: Sample) -> Sample:
+        # Calibrated in place (ts was stamped on receipt); the same record
+        # goes on to the logger and the UI
+        sample.calibrated_mass = self.calibrate_mass(sample.mass, sample.zone)
+        return sample
     
-    def log_data(self, data: Dict[str, Any]):
-        date_str = datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(self.data_dir, f"zone_{data['zone']}_{date_str}.csv")
+    def log_data(self, sample: Sample):
+        zone = sample.zone
+        aggregator = self.aggregators.get(zone)
+        if aggregator is None:
+            aggregator = IntervalAggregator(zone, self.log_interval)
+            self.aggregators[zone] = aggregator
+        
+        self._track_gaps(sample)
         
-        file_exists = os.path.exists(log_file)
+        record = aggregator.add(sample, sample.ts)
+        if record:
+            self._store_record(record)
+        self.rollups.add(zone, sample, sample.ts)
         
-        with open(log_file, 'a', newline='') as csvfile:
-            fieldnames = ['timestamp', 'zone', 'temp', 'hum', 'mass', 'calibrated_mass']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(data)
+        self._set_equilibrium_state(zone, self.get_detector(zone).update(sample.ts, sample.calibrated_mass))
     
-    def get_recent_data(self, zone: int, hours: int = 1) -> List[Dict[str, Any]]:
-        date_str = datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(self.data_dir, f"zone_{zone}_{date_str}.csv")
+    def _track_gaps(self, sample: Sample):
+        tracker = self.gap_trackers.get(sample.zone)
+        if tracker is None:
+            # Picks up from the last logged record, so downtime of the app
+            # itself is on record as a gap too
+            tracker = GapTracker(sample.zone, self.log_interval,
+                                 resume_ts=self.get_buffer(sample.zone).last_timestamp())
+            self.gap_trackers[sample.zone] = tracker
         
-        if not os.path.exists(log_file):
+        gap = tracker.update(sample)
+        if gap:
+            if gap['missing']:
+                print(f"Zone {sample.zone}: {gap['missing']} sample(s) missing over "
+                      f"{gap['end_ts'] - gap['ts']:.1f}s")
+            else:
+                print(f"Zone {sample.zone}: logging resumed after {gap['end_ts'] - gap['ts']:.1f}s")
+            self.gap_storage.write(gap)
+    
+    def get_gap_stats(self) -> Dict[int, Dict[str, Any]]:
+        return {zone: tracker.stats() for zone, tracker in list(self.gap_trackers.items())}
+    
+    def get_gaps(self, zone: int, start: datetime, end: datetime) -> List[Dict[str, float]]:
+        return list(self.gap_storage.iter_range(zone, start.timestamp(), end.timestamp()))
+    
+    def get_recent_gaps(self, zone: int, since_ts: float) -> List[Dict[str, float]]:
+        # Served from memory, in the shape get_gaps returns: the live chart
+        # asks on every tick
+        tracker = self.gap_trackers.get(zone)
+        if tracker is None:
             return []
-        
-        recent_data = []
-        cutoff_time = datetime.now().timestamp() - (hours * 3600)
+        return [{'timestamp': gap['ts'], 'end_ts': gap['end_ts'], 'missing': gap['missing']}
+                for gap in list(tracker.recent_gaps) if gap['end_ts'] > since_ts]
+    
+    def _store_record(self, record: Dict[str, Any]):
+        self.get_buffer(record['zone']).append(record['ts'], self._buffer_values(record))
+        self.storage.write(record)
+    
+    def close(self):
+        self.retention_worker.stop()
+        for aggregator in list(self.aggregators.values()):
+            record = aggregator.flush()
+            if record:
+                self._store_record(record)
+        self.rollups.close()
+        self.gap_storage.close()
+        self.storage.close()
+    
+    def get_buffer(self, zone: int) -> SampleRingBuffer:
+        buffer = self.buffers.get(zone)
+        if buffer is None:
+            with self.buffers_lock:
+                buffer = self.buffers.get(zone)
+                if buffer is None:
+                    buffer = SampleRingBuffer(self.buffer_capacity, BUFFER_FIELDS)
+                    self._seed_buffer(zone, buffer)
+                    self.buffers[zone] = buffer
+        return buffer
+    
+    def _seed_buffer(self, zone: int, buffer: SampleRingBuffer):
+        now = self.timebase.now()
+        cutoff_time = now - self.buffer_hours * 3600
         
         try:
-            with open(log_file, 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    timestamp = datetime.fromisoformat(row['timestamp']).timestamp()
-                    if timestamp >= cutoff_time:
-                        recent_data.append(row)
+            for row in self.storage.iter_range(zone, cutoff_time, now + 1):
+                buffer.append(row['timestamp'], self._buffer_values(row))
         except Exception as e:
-            print(f"Error reading recent data: {e}")
+            print(f"Error seeding zone {zone} buffer: {e}")
+    
+    @staticmethod
+    def _buffer_values(record: Dict[str, Any]) -> Dict[str, float]:
+        values = {field: float(record.get(field, 0.0)) for field in ('temp', 'hum', 'mass', 'calibrated_mass')}
+        values['calibrated_mass_min'] = float(record.get('calibrated_mass_min', values['calibrated_mass']))
+        values['calibrated_mass_max'] = float(record.get('calibrated_mass_max', values['calibrated_mass']))
+        return values
+    
+    def get_recent_data(self, zone: int, hours: float = 1) -> List[Dict[str, Any]]:
+        now = self.timebase.now()
+        cutoff_time = now - (hours * 3600)
+        if hours > self.buffer_hours:
+            return self.get_history(zone, datetime.fromtimestamp(cutoff_time), datetime.fromtimestamp(now),
+                                    max_points=self.history_max_points)
+        
+        window = self.get_buffer(zone).window(cutoff_time)
         
+        recent_data = []
+        for i, timestamp in enumerate(window['timestamp']):
+            row = {
+                'timestamp': datetime.fromtimestamp(timestamp).astimezone().isoformat(),
+                'zone': zone
+            }
+            for field in BUFFER_FIELDS:
+                row[field] = window[field][i]
+            recent_data.append(row)
         return recent_data
     
-    def is_mass_equilibrated(self, zone: int, stability_threshold: float = 0.1, 
-                           check_duration_minutes: int = 30) -> bool:
-        recent_data = self.get_recent_data(zone, hours=1)
-        
-        if len(recent_data) < 3:
-            return False
+    def get_recent_series(self, zone: int, hours: float = 1) -> Dict[str, np.ndarray]:
+        now = self.timebase.now()
+        cutoff_time = now - (hours * 3600)
+        if hours <= self.buffer_hours:
+            series = self.get_buffer(zone).window_arrays(cutoff_time)
+            series['spacing'] = np.full(len(series['timestamp']), float(self.log_interval))
+            return series
         
-        cutoff_time = datetime.now().timestamp() - (check_duration_minutes * 60)
-        stable_readings = []
+        return self._get_history_series(zone, cutoff_time, now, self.history_max_points)
+    
+    def _get_history_series(self, zone: int, start_ts: float, end_ts: float,
+                            max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        bucket = self._history_bucket(start_ts, end_ts, max_points)
+        if hasattr(self.storage, "read_series"):
+            # Binary records are bucketed in NumPy and reach the chart as
+            # columns, never as rows
+            series = self.storage.read_series(zone, start_ts, end_ts, bucket)
+            for field in ('calibrated_mass_min', 'calibrated_mass_max'):
+                series.setdefault(field, series['calibrated_mass'])
+        else:
+            rows = self._get_history_rows(zone, start_ts, end_ts, max_points)
+            series = {'timestamp': np.fromiter((row['timestamp'] for row in rows), dtype=float, count=len(rows))}
+            for field in BUFFER_FIELDS:
+                series[field] = np.fromiter((row.get(field, np.nan) for row in rows), dtype=float, count=len(rows))
         
-        for reading in recent_data:
-            timestamp = datetime.fromisoformat(reading['timestamp']).timestamp()
-            if timestamp >= cutoff_time:
-                try:
-                    mass = float(reading['calibrated_mass'])
-                    stable_readings.append(mass)
-                except ValueError:
-                    continue
+        # Nominal spacing of every point, so the chart can tell a gap from
+        # the step of the source the point came from
+        series['spacing'] = np.full(len(series['timestamp']), float(bucket or self.log_interval))
+        return series
+    
+    def iter_history(self, zone: int, start: datetime, end: datetime) -> Iterator[Dict[str, Any]]:
+        for row in self.storage.iter_range(zone, start.timestamp(), end.timestamp()):
+            yield self._history_row(zone, row)
+    
+    def get_history(self, zone: int, start: datetime, end: datetime,
+                    max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._get_history_rows(zone, start.timestamp(), end.timestamp(), max_points)
+        return [self._history_row(zone, row) for row in rows]
+    
+    def _history_bucket(self, start_ts: float, end_ts: float, max_points: Optional[int]) -> Optional[float]:
+        # Bucket width that keeps the range within max_points, when that is
+        # coarser than the log itself
+        if max_points:
+            resolution = (end_ts - start_ts) / max_points
+            if resolution > self.log_interval:
+                return resolution
+        return None
+    
+    def _get_history_rows(self, zone: int, start_ts: float, end_ts: float,
+                          max_points: Optional[int] = None) -> List[Dict[str, float]]:
+        bucket = self._history_bucket(start_ts, end_ts, max_points)
+        if bucket is None:
+            return list(self.storage.iter_range(zone, start_ts, end_ts))
         
-        if len(stable_readings) < 3:
-            return False
+        # Backends that bucket by themselves (SQL, NumPy) answer for the whole
+        # range; the CSV log goes through the rollup tiers
+        if hasattr(self.storage, "read_buckets"):
+            return list(self.storage.read_buckets(zone, start_ts, end_ts, bucket))
+        tier = self.rollups.select_tier(bucket)
+        if tier and tier > self.log_interval:
+            rows = self._iter_rollup_rows(zone, tier, start_ts, end_ts)
+        else:
+            rows = self.storage.iter_range(zone, start_ts, end_ts)
+        # Merged while streaming, so neither raw rows nor a finer tier than
+        # the resolution can push the result past max_points
+        return list(merge_buckets(rows, bucket))
+    
+    def _iter_rollup_rows(self, zone: int, tier: int, start_ts: float,
+                          end_ts: float) -> Iterator[Dict[str, float]]:
+        rows = list(self.rollups.iter_range(tier, zone, start_ts, end_ts))
         
-        mass_range = max(stable_readings) - min(stable_readings)
-        return mass_range <= stability_threshold
+        # Rollups only exist from when they were first collected; older parts
+        # of the range are filled from the raw log
+        covered_from = rows[0]['timestamp'] if rows else end_ts
+        if covered_from > start_ts + tier:
+            yield from self.storage.iter_range(zone, start_ts, covered_from)
+        yield from rows
+    
+    def export_csv(self, zone: int, start: datetime, end: datetime, path: str) -> int:
+        count = 0
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=AGGREGATED_FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            for row in self.iter_history(zone, start, end):
+                writer.writerow(row)
+                count += 1
+        return count
+    
+    @staticmethod
+    def _history_row(zone: int, row: Dict[str, float]) -> Dict[str, Any]:
+        history_row = dict(row)
+        history_row['timestamp'] = datetime.fromtimestamp(row['timestamp']).astimezone().isoformat()
+        history_row['zone'] = zone
+        return history_row
+    
+    def set_equilibrium_callback(self, equilibrium_callback: Callable = None):
+        self.equilibrium_callback = equilibrium_callback
+    
+    def get_detector(self, zone: int) -> EquilibriumDetector:
+        detector = self.detectors.get(zone)
+        if detector is None:
+            with self.detectors_lock:
+                detector = self.detectors.get(zone)
+                if detector is None:
+                    detector = self._create_detector(zone)
+                    self.detectors[zone] = detector
+        return detector
+    
+    def _create_detector(self, zone: int) -> EquilibriumDetector:
+        eq_config = self.settings.get_equilibrium_config(zone)
+        detector = EquilibriumDetector(
+            stability_threshold=eq_config["stability_threshold"],
+            window_minutes=eq_config["window_minutes"]
+        )
+        window = self.get_buffer(zone).window(
+            self.timebase.now() - eq_config["window_minutes"] * 60
+        )
+        for i, timestamp in enumerate(window['timestamp']):
+            detector.update(timestamp, window['calibrated_mass_min'][i],
+                            window['calibrated_mass_max'][i])
+        return detector
+    
+    def configure_equilibrium(self, zone: int, stability_threshold: float, window_minutes: float):
+        self.settings.update_equilibrium_config(
+            zone, stability_threshold=stability_threshold, window_minutes=window_minutes
+        )
+        self.get_detector(zone).configure(stability_threshold, window_minutes)
+        self.is_mass_equilibrated(zone)
+    
+    def _set_equilibrium_state(self, zone: int, is_equilibrated: bool):
+        if self.equilibrium_states.get(zone) == is_equilibrated:
+            return
+        self.equilibrium_states[zone] = is_equilibrated
+        if self.equilibrium_callback:
+            self.equilibrium_callback(zone, is_equilibrated)
+    
+    def is_mass_equilibrated(self, zone: int) -> bool:
+        is_equilibrated = self.get_detector(zone).evaluate(self.timebase.now())
+        self._set_equilibrium_state(zone, is_equilibrated)
+        return is_equilibrated
     
     def tare_mass(self, zone: int, current_mass: float):
         self.settings.update_mass_calibration(zone, tare=current_mass)
@@ -0,0 +1,148 @@
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+class DayFileStorage(ABC):
+    file_extension = ""
+
+    def __init__(self, data_dir: str, flush_rows: int = 50, flush_seconds: float = 5.0):
+        self.data_dir = data_dir
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.files: Dict[int, Tuple[str, Any]] = {}
+        self.lock = threading.Lock()
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        self.flush_event = threading.Event()
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flush_thread.start()
+
+    def day_file_path(self, zone: int, date_str: str) -> str:
+        return os.path.join(self.data_dir, f"zone_{zone}_{date_str}{self.file_extension}")
+
+    @abstractmethod
+    def _open_day_file(self, path: str):
+        pass
+
+    @abstractmethod
+    def read_range(self, zone: int, date_str: str, start_ts: Optional[float] = None,
+                   end_ts: Optional[float] = None) -> Iterator[Dict[str, float]]:
+        pass
+
+    @staticmethod
+    def day_strs(start_ts: float, end_ts: float) -> Iterator[str]:
+        day = datetime.fromtimestamp(start_ts).date()
+        last_day = datetime.fromtimestamp(end_ts).date()
+        while day <= last_day:
+            yield day.strftime("%Y%m%d")
+            day += timedelta(days=1)
+
+    def iter_range(self, zone: int, start_ts: float, end_ts: float) -> Iterator[Dict[str, float]]:
+        for date_str in self.day_strs(start_ts, end_ts):
+            yield from self.read_range(zone, date_str, start_ts, end_ts)
+
+    def list_day_files(self) -> List[Tuple[int, str, str]]:
+        pattern = re.compile(rf"zone_(\d+)_(\d{{8}}){re.escape(self.file_extension)}(\.gz)?$")
+        day_files = []
+        for name in sorted(os.listdir(self.data_dir)):
+            match = pattern.match(name)
+            if match:
+                day_files.append((int(match.group(1)), match.group(2), os.path.join(self.data_dir, name)))
+        return day_files
+
+    def apply_retention(self, max_log_days: int, throttle_seconds: float = 0.0):
+        today = datetime.now().date()
+        cutoff_str = (today - timedelta(days=max_log_days)).strftime("%Y%m%d")
+        today_str = today.strftime("%Y%m%d")
+
+        with self.lock:
+            open_paths = {day_file.path for _, day_file in self.files.values()}
+
+        for zone, date_str, path in self.list_day_files():
+            # Day names come from sample stamps, not this wall clock, so a
+            # clock step must never remove or compress a file being written
+            if path in open_paths:
+                continue
+            if date_str < cutoff_str:
+                os.remove(path)
+                print(f"Removed expired log {path}")
+            elif (date_str < today_str and not path.endswith(".gz") and
+                  time.time() - os.path.getmtime(path) > 3600):
+                self._compress(path)
+            else:
+                continue
+            if throttle_seconds:
+                time.sleep(throttle_seconds)
+
+    @staticmethod
+    def _compress(path: str):
+        tmp_path = path + ".gz.tmp"
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, path + ".gz")
+        os.remove(path)
+
+    def write(self, data: Dict[str, Any]):
+        zone = data['zone']
+        date_str = self._date_str(data)
+
+        with self.lock:
+            day_file = self._get_day_file(zone, date_str)
+            day_file.rows.append(data)
+            if (len(day_file.rows) >= self.flush_rows or
+                    time.monotonic() - day_file.last_flush >= self.flush_seconds):
+                day_file.flush()
+
+    @staticmethod
+    def _date_str(data: Dict[str, Any]) -> str:
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, str) and len(timestamp) >= 10:
+            return timestamp[:10].replace('-', '')
+        return datetime.now().strftime("%Y%m%d")
+
+    def _get_day_file(self, zone: int, date_str: str):
+        current = self.files.get(zone)
+        if current and current[0] == date_str:
+            return current[1]
+
+        # Midnight rollover: close yesterday's handle before opening today's
+        if current:
+            current[1].close()
+
+        day_file = self._open_day_file(self.day_file_path(zone, date_str))
+        self.files[zone] = (date_str, day_file)
+        return day_file
+
+    def flush(self, zone: Optional[int] = None):
+        with self.lock:
+            for file_zone, (_, day_file) in self.files.items():
+                if zone is None or file_zone == zone:
+                    day_file.flush()
+
+    def _flush_loop(self):
+        while not self.flush_event.wait(self.flush_seconds):
+            try:
+                now = time.monotonic()
+                with self.lock:
+                    for _, day_file in self.files.values():
+                        if day_file.rows and now - day_file.last_flush >= self.flush_seconds:
+                            day_file.flush()
+            except Exception as e:
+                print(f"Log flush error: {e}")
+
+    def close(self):
+        self.flush_event.set()
+        with self.lock:
+            for _, day_file in self.files.values():
+                try:
+                    day_file.close()
+                except Exception as e:
+                    print(f"Error closing log file {day_file.path}: {e}")
+            self.files = {}
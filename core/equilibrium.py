@@ -0,0 +1,60 @@
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+class EquilibriumDetector:
+    def __init__(self, stability_threshold: float = 0.1, window_minutes: float = 30,
+                 min_samples: int = 3):
+        self.stability_threshold = stability_threshold
+        self.window_seconds = window_minutes * 60
+        self.min_samples = min_samples
+        self.timestamps: Deque[float] = deque()
+        self.min_values: Deque[Tuple[float, float]] = deque()
+        self.max_values: Deque[Tuple[float, float]] = deque()
+        self.is_equilibrated = False
+        self.lock = threading.Lock()
+
+    def configure(self, stability_threshold: float, window_minutes: float):
+        with self.lock:
+            self.stability_threshold = stability_threshold
+            self.window_seconds = window_minutes * 60
+
+    def update(self, timestamp: float, low: float, high: Optional[float] = None) -> bool:
+        if high is None:
+            high = low
+
+        with self.lock:
+            self._push(timestamp, low, high)
+            return self._evaluate(timestamp)
+
+    def evaluate(self, now: float) -> bool:
+        with self.lock:
+            return self._evaluate(now)
+
+    def _push(self, timestamp: float, low: float, high: float):
+        self.timestamps.append(timestamp)
+
+        # Monotonic deques: the front always holds the window extreme
+        while self.min_values and self.min_values[-1][1] >= low:
+            self.min_values.pop()
+        self.min_values.append((timestamp, low))
+
+        while self.max_values and self.max_values[-1][1] <= high:
+            self.max_values.pop()
+        self.max_values.append((timestamp, high))
+
+    def _evaluate(self, now: float) -> bool:
+        cutoff = now - self.window_seconds
+        while self.timestamps and self.timestamps[0] < cutoff:
+            self.timestamps.popleft()
+        while self.min_values and self.min_values[0][0] < cutoff:
+            self.min_values.popleft()
+        while self.max_values and self.max_values[0][0] < cutoff:
+            self.max_values.popleft()
+
+        if len(self.timestamps) < self.min_samples:
+            self.is_equilibrated = False
+        else:
+            mass_range = self.max_values[0][1] - self.min_values[0][1]
+            self.is_equilibrated = mass_range <= self.stability_threshold
+        return self.is_equilibrated
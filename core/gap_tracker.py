@@ -0,0 +1,98 @@
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional
+from core.sample import Sample
+
+GAP_FIELDNAMES = ['timestamp', 'zone', 'end_ts', 'missing', 'by_seq']
+
+SEQ_MODULUS = 1 << 32
+
+class GapTracker:
+    def __init__(self, zone: int, expected_interval: float, gap_factor: float = 3.0,
+                 resume_ts: Optional[float] = None):
+        self.zone = zone
+        self.expected_interval = expected_interval
+        self.gap_factor = gap_factor
+        # Last record logged before this run: the silence since then is a gap
+        # in the log, but not one the link is counted for
+        self.resume_ts = resume_ts
+        self.last_seq: Optional[int] = None
+        self.last_ts: Optional[float] = None
+        self.period: Optional[float] = None
+
+        self.received = 0
+        self.expected = 0
+        self.missed = 0
+        self.gaps = 0
+        self.duplicates = 0
+        self.seq_resets = 0
+        # Latest gaps kept in memory for the live chart
+        self.recent_gaps: deque = deque(maxlen=64)
+
+    def update(self, sample: Sample) -> Optional[Dict[str, Any]]:
+        self.received += 1
+        missing = 0
+        gap = None
+        by_seq = sample.seq is not None and self.last_seq is not None
+
+        if by_seq:
+            step = (sample.seq - self.last_seq) % SEQ_MODULUS
+            if step == 0:
+                self.duplicates += 1
+            elif step >= SEQ_MODULUS // 2:
+                # The counter went backwards: the device restarted
+                self.seq_resets += 1
+                self.expected += 1
+            else:
+                self.expected += step
+                missing = step - 1
+        elif self.last_ts is not None:
+            elapsed = sample.ts - self.last_ts
+            # Without sequence numbers a gap is a silence several times longer
+            # than both the logging interval and the usual sample spacing
+            baseline = max(self.expected_interval, self.period or 0.0)
+            if baseline > 0 and elapsed > self.gap_factor * baseline:
+                missing = max(1, round(elapsed / (self.period or baseline)) - 1)
+                self.expected += missing + 1
+            else:
+                self.expected += 1
+                if elapsed > 0:
+                    self.period = elapsed if self.period is None else 0.9 * self.period + 0.1 * elapsed
+        else:
+            self.expected += 1
+            if (self.resume_ts is not None and
+                    sample.ts - self.resume_ts > self.gap_factor * self.expected_interval):
+                gap = self._gap(self.resume_ts, sample.ts, 0, False)
+
+        if missing:
+            self.missed += missing
+            self.gaps += 1
+            gap = self._gap(self.last_ts, sample.ts, missing, by_seq)
+        if gap:
+            self.recent_gaps.append(gap)
+
+        if sample.seq is not None:
+            self.last_seq = sample.seq
+        self.last_ts = sample.ts
+        return gap
+
+    def _gap(self, start_ts: float, end_ts: float, missing: int, by_seq: bool) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.fromtimestamp(start_ts).astimezone().isoformat(),
+            'ts': start_ts,
+            'zone': self.zone,
+            'end_ts': end_ts,
+            'missing': missing,
+            'by_seq': int(by_seq)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'received': self.received,
+            'expected': self.expected,
+            'missed': self.missed,
+            'gaps': self.gaps,
+            'duplicates': self.duplicates,
+            'seq_resets': self.seq_resets,
+            'last_ts': self.last_ts
+        }
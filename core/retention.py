@@ -0,0 +1,43 @@
+import os
+import threading
+from typing import List, Optional
+
+class RetentionWorker:
+    def __init__(self, storages: List, max_log_days: int, interval_hours: float = 6.0,
+                 start_delay_seconds: float = 60.0, throttle_seconds: float = 0.5):
+        self.storages = storages
+        self.max_log_days = max_log_days
+        self.interval_seconds = interval_hours * 3600
+        self.start_delay_seconds = start_delay_seconds
+        self.throttle_seconds = throttle_seconds
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _lower_priority(self):
+        # On Linux a thread's native id is a valid target for setpriority,
+        # which keeps compaction from competing with the ingest threads
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+    def _run(self):
+        self._lower_priority()
+        if self.stop_event.wait(self.start_delay_seconds):
+            return
+
+        while True:
+            for storage in self.storages:
+                try:
+                    storage.apply_retention(self.max_log_days, self.throttle_seconds)
+                except Exception as e:
+                    print(f"Log retention error: {e}")
+            if self.stop_event.wait(self.interval_seconds):
+                return
@@ -0,0 +1,89 @@
+import threading
+from array import array
+from typing import Dict, List, Optional
+import numpy as np
+
+class SampleRingBuffer:
+    def __init__(self, capacity: int, fields: List[str]):
+        self.capacity = max(1, int(capacity))
+        self.fields = list(fields)
+        self.timestamps = array('d', bytes(8 * self.capacity))
+        self.columns: Dict[str, array] = {
+            field: array('d', bytes(8 * self.capacity)) for field in self.fields
+        }
+        self.head = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        with self.lock:
+            # Keep the buffer time-ordered so window lookups can bisect
+            if self.size and timestamp < self.timestamps[self._physical(self.size - 1)]:
+                return
+
+            if self.size < self.capacity:
+                index = self._physical(self.size)
+                self.size += 1
+            else:
+                index = self.head
+                self.head = (self.head + 1) % self.capacity
+
+            self.timestamps[index] = timestamp
+            for field in self.fields:
+                self.columns[field][index] = values.get(field, 0.0)
+
+    def last_timestamp(self) -> Optional[float]:
+        with self.lock:
+            return self.timestamps[self._physical(self.size - 1)] if self.size else None
+
+    def _physical(self, logical: int) -> int:
+        return (self.head + logical) % self.capacity
+
+    def _first_index_at_or_after(self, timestamp: float) -> int:
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            if self.timestamps[self._physical(mid)] < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def window(self, start: float, end: Optional[float] = None) -> Dict[str, List[float]]:
+        with self.lock:
+            first = self._first_index_at_or_after(start)
+            last = self.size if end is None else self._first_index_at_or_after(end)
+            indices = [self._physical(i) for i in range(first, last)]
+            result = {'timestamp': [self.timestamps[i] for i in indices]}
+            for field in self.fields:
+                column = self.columns[field]
+                result[field] = [column[i] for i in indices]
+            return result
+
+    def window_arrays(self, start: float, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        with self.lock:
+            first = self._first_index_at_or_after(start)
+            last = self.size if end is None else self._first_index_at_or_after(end)
+            # At most two contiguous slices of the backing arrays, copied out
+            # so callers never see later writes
+            spans = []
+            if first < last:
+                begin, finish = self._physical(first), self._physical(last - 1) + 1
+                if begin < finish:
+                    spans = [(begin, finish)]
+                else:
+                    spans = [(begin, self.capacity), (0, finish)]
+
+            def gather(column: array) -> np.ndarray:
+                values = np.frombuffer(column, dtype=np.float64)
+                if not spans:
+                    return np.empty(0)
+                return np.concatenate([values[a:b] for a, b in spans])
+
+            result = {'timestamp': gather(self.timestamps)}
+            for field in self.fields:
+                result[field] = gather(self.columns[field])
+            return result
@@ -0,0 +1,53 @@
+import os
+from typing import Dict, Iterator, List, Optional
+from core.aggregator import IntervalAggregator, AGGREGATED_FIELDNAMES
+from core.csv_storage import CsvStorage
+from core.sample import Sample
+
+class RollupStore:
+    def __init__(self, data_dir: str, tiers: List[int], flush_rows: int = 50,
+                 flush_seconds: float = 5.0):
+        self.tiers = sorted(tiers)
+        self.aggregators: Dict[int, Dict[int, IntervalAggregator]] = {tier: {} for tier in self.tiers}
+        self.storages: Dict[int, CsvStorage] = {
+            tier: CsvStorage(
+                os.path.join(data_dir, f"{tier}s"),
+                fieldnames=AGGREGATED_FIELDNAMES,
+                flush_rows=flush_rows,
+                flush_seconds=flush_seconds
+            )
+            for tier in self.tiers
+        }
+
+    def add(self, zone: int, sample: Sample, timestamp: float):
+        for tier in self.tiers:
+            aggregator = self.aggregators[tier].get(zone)
+            if aggregator is None:
+                aggregator = IntervalAggregator(zone, tier)
+                self.aggregators[tier][zone] = aggregator
+            record = aggregator.add(sample, timestamp)
+            if record:
+                self.storages[tier].write(record)
+
+    def select_tier(self, resolution_seconds: float) -> Optional[int]:
+        # Coarsest tier whose buckets are still no wider than the resolution
+        selected = None
+        for tier in self.tiers:
+            if tier <= resolution_seconds:
+                selected = tier
+        return selected
+
+    def iter_range(self, tier: int, zone: int, start_ts: float, end_ts: float) -> Iterator[Dict[str, float]]:
+        return self.storages[tier].iter_range(zone, start_ts, end_ts)
+
+    def apply_retention(self, max_log_days: int, throttle_seconds: float = 0.0):
+        for storage in self.storages.values():
+            storage.apply_retention(max_log_days, throttle_seconds)
+
+    def close(self):
+        for tier in self.tiers:
+            for aggregator in self.aggregators[tier].values():
+                record = aggregator.flush()
+                if record:
+                    self.storages[tier].write(record)
+            self.storages[tier].close()
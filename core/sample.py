@@ -0,0 +1,160 @@
+import binascii
+import json
+import struct
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+_loads = orjson.loads if orjson else json.loads
+_NUMBER_TYPES = (int, float)
+
+# Binary frame: sync word, payload length, payload, CRC-16/CCITT (init 0xFFFF)
+# over the length byte and payload, little-endian throughout
+FRAME_SYNC = b'\xa5\x5a'
+FRAME_HEADER_SIZE = len(FRAME_SYNC) + 1
+FRAME_CRC = struct.Struct('<H')
+FRAME_PAYLOAD = struct.Struct('<Bfff')
+# Optional trailing fields: sequence number, then device time in seconds
+FRAME_SEQ = struct.Struct('<I')
+FRAME_DEVICE_TS = struct.Struct('<d')
+FRAME_OVERHEAD = FRAME_HEADER_SIZE + FRAME_CRC.size
+FRAME_MAX_PAYLOAD = 64
+
+class Sample:
+    __slots__ = ('zone', 'temp', 'hum', 'mass', 'calibrated_mass', 'ts', 'seq', 'device_ts')
+
+    def __init__(self, zone: int, temp: float, hum: float, mass: float,
+                 calibrated_mass: float = 0.0, ts: float = 0.0,
+                 seq: Optional[int] = None, device_ts: Optional[float] = None):
+        self.zone = zone
+        self.temp = temp
+        self.hum = hum
+        self.mass = mass
+        self.calibrated_mass = calibrated_mass
+        self.ts = ts
+        self.seq = seq
+        self.device_ts = device_ts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"Sample({self.to_dict()})"
+
+def decode_sample(line: Union[bytes, bytearray, str]) -> Sample:
+    # Raises ValueError on a bad line; json, orjson and UTF-8 decode errors
+    # all derive from it
+    try:
+        data = _loads(line)
+    except ValueError as e:
+        raise ValueError(f"JSON parse error: {e}")
+    if type(data) is not dict:
+        raise ValueError(f"Expected a JSON object: {_preview(line)}")
+
+    try:
+        zone = data["zone"]
+        temp = data["temp"]
+        hum = data["hum"]
+        mass = data["mass"]
+    except KeyError:
+        raise ValueError(f"Missing keys in data: {_preview(line)}")
+
+    # bool is a subclass of int, so compare exact types
+    if type(zone) is not int:
+        raise ValueError(f"Invalid zone {zone!r}: {_preview(line)}")
+    if (type(temp) not in _NUMBER_TYPES or type(hum) not in _NUMBER_TYPES or
+            type(mass) not in _NUMBER_TYPES):
+        raise ValueError(f"Non-numeric reading: {_preview(line)}")
+
+    sample = Sample(zone, float(temp), float(hum), float(mass))
+
+    seq = data.get("seq")
+    if seq is not None:
+        if type(seq) is not int:
+            raise ValueError(f"Invalid seq {seq!r}: {_preview(line)}")
+        sample.seq = seq
+    device_ts = data.get("device_ts")
+    if device_ts is not None:
+        if type(device_ts) not in _NUMBER_TYPES:
+            raise ValueError(f"Invalid device_ts {device_ts!r}: {_preview(line)}")
+        sample.device_ts = float(device_ts)
+
+    return sample
+
+def encode_frame(zone: int, temp: float, hum: float, mass: float,
+                 seq: Optional[int] = None, device_ts: Optional[float] = None) -> bytes:
+    # Trailing fields are positional, so a device time needs a sequence number
+    if device_ts is not None and seq is None:
+        raise ValueError("device_ts requires seq in a binary frame")
+    payload = FRAME_PAYLOAD.pack(zone, temp, hum, mass)
+    if seq is not None:
+        payload += FRAME_SEQ.pack(seq & 0xFFFFFFFF)
+    if device_ts is not None:
+        payload += FRAME_DEVICE_TS.pack(device_ts)
+    body = bytes([len(payload)]) + payload
+    return FRAME_SYNC + body + FRAME_CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+def frame_crc_ok(frame: bytes) -> bool:
+    body = frame[len(FRAME_SYNC):-FRAME_CRC.size]
+    return FRAME_CRC.unpack_from(frame, len(frame) - FRAME_CRC.size)[0] == binascii.crc_hqx(body, 0xFFFF)
+
+def decode_frame_payload(payload: bytes) -> Sample:
+    # Longer payloads are accepted so firmware can append fields
+    if len(payload) < FRAME_PAYLOAD.size:
+        raise ValueError(f"Binary payload too short ({len(payload)} bytes)")
+    zone, temp, hum, mass = FRAME_PAYLOAD.unpack_from(payload)
+    sample = Sample(zone, temp, hum, mass)
+
+    offset = FRAME_PAYLOAD.size
+    if len(payload) >= offset + FRAME_SEQ.size:
+        sample.seq = FRAME_SEQ.unpack_from(payload, offset)[0]
+        offset += FRAME_SEQ.size
+    if len(payload) >= offset + FRAME_DEVICE_TS.size:
+        sample.device_ts = FRAME_DEVICE_TS.unpack_from(payload, offset)[0]
+    return sample
+
+def _preview(line: Union[bytes, bytearray, str]) -> str:
+    if isinstance(line, (bytes, bytearray)):
+        line = bytes(line[:200]).decode('utf-8', errors='replace')
+    return line.strip()
+
+def _legacy_decode(line: str) -> Dict[str, Any]:
+    # The previous path: json.loads, key presence check, then the dict copy
+    # and ISO timestamp added by DataManager.process_sensor_data
+    from datetime import datetime
+    data = json.loads(line)
+    if not all(key in data for key in ["zone", "temp", "hum", "mass"]):
+        raise ValueError("Missing keys")
+    processed = data.copy()
+    processed["timestamp"] = datetime.now().isoformat()
+    processed["calibrated_mass"] = float(data["mass"])
+    return processed
+
+def benchmark(lines: int = 200000) -> Dict[str, float]:
+    import time
+    frame = b'{"zone": 3, "temp": 23.41, "hum": 45.2, "mass": 1523.75}'
+    text = frame.decode('utf-8')
+
+    def run(decode, payload) -> float:
+        started = time.perf_counter()
+        for _ in range(lines):
+            decode(payload)
+        return lines / (time.perf_counter() - started)
+
+    def fast_path(payload):
+        sample = decode_sample(payload)
+        sample.calibrated_mass = sample.mass
+        sample.ts = time.time()
+
+    return {"legacy": run(_legacy_decode, text), JSON_BACKEND: run(fast_path, frame)}
+
+if __name__ == "__main__":
+    results = benchmark()
+    for name, rate in results.items():
+        print(f"{name:>8}: {rate:12,.0f} lines/s")
+    print(f"speedup: {results[JSON_BACKEND] / results['legacy']:.2f}x")
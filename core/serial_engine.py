@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import selectors
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+class SerialEngine:
+    def __init__(self, reconnect_delay: float = 2.0, max_reconnect_delay: float = 30.0):
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.selector = selectors.DefaultSelector()
+        self.timers: List[Tuple[float, int, Callable]] = []
+        self.timer_ids = itertools.count()
+        self.pending: List[Callable] = []
+        self.pending_lock = threading.Lock()
+        self.handlers: Dict[int, dict] = {}
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+        self.status_callback: Optional[Callable] = None
+
+        # Self-pipe so other threads can wake a loop blocked in select()
+        self.wake_reader, self.wake_writer = socket.socketpair()
+        self.wake_reader.setblocking(False)
+        self.wake_writer.setblocking(False)
+        self.selector.register(self.wake_reader, selectors.EVENT_READ, None)
+
+    def set_status_callback(self, status_callback: Callable):
+        self.status_callback = status_callback
+
+    def _notify(self, handler, connected: bool):
+        if self.status_callback:
+            self.status_callback(handler, connected)
+
+    def start(self):
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.call_soon_threadsafe(self._shutdown)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2.0)
+
+    def call_soon_threadsafe(self, callback: Callable):
+        with self.pending_lock:
+            self.pending.append(callback)
+        try:
+            self.wake_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def call_later(self, delay: float, callback: Callable):
+        # Loop thread only; other threads go through call_soon_threadsafe
+        heapq.heappush(self.timers, (time.monotonic() + delay, next(self.timer_ids), callback))
+
+    def call_repeating(self, interval: float, callback: Callable):
+        def tick():
+            try:
+                callback()
+            except Exception as e:
+                print(f"Serial engine timer error: {e}")
+            self.call_later(interval, tick)
+        self.call_soon_threadsafe(lambda: self.call_later(interval, tick))
+
+    def add_handler(self, handler) -> bool:
+        self.call_soon_threadsafe(lambda: self._add(handler))
+        return True
+
+    def remove_handler(self, handler):
+        done = threading.Event()
+
+        def remove():
+            self._remove(handler)
+            done.set()
+
+        if threading.current_thread() is self.thread:
+            remove()
+        else:
+            self.call_soon_threadsafe(remove)
+            done.wait(timeout=2.0)
+
+    def _add(self, handler):
+        self.handlers[id(handler)] = {"handler": handler, "delay": self.reconnect_delay, "fd": None,
+                                      "connecting": False}
+        self._open(handler)
+
+    def _remove(self, handler):
+        state = self.handlers.pop(id(handler), None)
+        if state:
+            self._close(state)
+
+    def _open(self, handler):
+        state = self.handlers.get(id(handler))
+        if state is None or state["connecting"]:
+            return
+        state["connecting"] = True
+
+        # Opening a port blocks (and connect() settles for a moment), so it
+        # runs on a helper thread and only the result comes back to the loop
+        def connect():
+            connected = handler.connect()
+            self.call_soon_threadsafe(lambda: self._on_connected(state, connected))
+
+        threading.Thread(target=connect, daemon=True).start()
+
+    def _on_connected(self, state: dict, connected: bool):
+        state["connecting"] = False
+        handler = state["handler"]
+        if self.handlers.get(id(handler)) is not state:
+            # Removed while the port was opening
+            if id(handler) not in self.handlers and handler.serial_conn and handler.serial_conn.is_open:
+                handler.serial_conn.close()
+            return
+
+        if not connected:
+            self._schedule_reconnect(state)
+            return
+
+        try:
+            fd = handler.serial_conn.fileno()
+        except (AttributeError, OSError, ValueError) as e:
+            # Ports without a selectable descriptor (e.g. on Windows)
+            # keep using their own reader thread
+            print(f"{handler.port} cannot be multiplexed ({e}), using a reader thread")
+            self.handlers.pop(id(handler), None)
+            handler.engine = None
+            handler.start_reading()
+            return
+
+        handler.serial_conn.timeout = 0
+        handler.reset_buffer()
+        handler.is_running = True
+        state["fd"] = fd
+        state["delay"] = self.reconnect_delay
+        self.selector.register(fd, selectors.EVENT_READ, state)
+        self._notify(handler, True)
+
+    def _close(self, state: dict):
+        handler = state["handler"]
+        handler.is_running = False
+        if state["fd"] is not None:
+            try:
+                self.selector.unregister(state["fd"])
+            except (KeyError, ValueError):
+                pass
+            state["fd"] = None
+        if handler.serial_conn and handler.serial_conn.is_open:
+            handler.serial_conn.close()
+
+    def _schedule_reconnect(self, state: dict):
+        handler = state["handler"]
+        delay = state["delay"]
+        state["delay"] = min(delay * 2, self.max_reconnect_delay)
+        self.call_later(delay, lambda: self._open(handler))
+
+    def _on_readable(self, state: dict):
+        handler = state["handler"]
+        try:
+            data = handler.serial_conn.read(handler.serial_conn.in_waiting or 1)
+        except Exception as e:
+            self._close(state)
+            self._notify(handler, False)
+            if handler.error_callback:
+                handler.error_callback(f"Serial connection lost: {e}")
+            if id(handler) in self.handlers:
+                self._schedule_reconnect(state)
+            return
+
+        if not data:
+            return
+        try:
+            handler.feed(data)
+        except Exception as e:
+            # feed() runs the whole downstream chain (calibration, logging,
+            # UI); a failure there costs this read, not the port or the loop
+            handler.feed_errors += 1
+            if handler.feed_errors == 1 or handler.feed_errors % 1000 == 0:
+                print(f"{handler.port}: error handling data ({handler.feed_errors} so far): {e}")
+
+    def _run_pending(self):
+        with self.pending_lock:
+            pending, self.pending = self.pending, []
+        for callback in pending:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Serial engine error: {e}")
+
+    def _run_timers(self):
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            _, _, callback = heapq.heappop(self.timers)
+            try:
+                callback()
+            except Exception as e:
+                print(f"Serial engine timer error: {e}")
+
+    def _next_timeout(self) -> Optional[float]:
+        if not self.timers:
+            return None
+        return max(0.0, self.timers[0][0] - time.monotonic())
+
+    def _run(self):
+        while self.is_running:
+            for key, _ in self.selector.select(self._next_timeout()):
+                if key.data is None:
+                    try:
+                        while self.wake_reader.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    try:
+                        self._on_readable(key.data)
+                    except Exception as e:
+                        print(f"Serial engine error: {e}")
+            self._run_pending()
+            self._run_timers()
+
+    def _shutdown(self):
+        for state in list(self.handlers.values()):
+            self._close(state)
+        self.handlers = {}
+        self.is_running = False
@@ -1,28 +1,62 @@
 import serial
-import json
 import threading
 import time
-from typing import Callable, Optional, Dict, Any
+from typing import Callable, Optional, Dict, List
+from core.timebase import Timebase
+from core.sample import (Sample, decode_sample, decode_frame_payload, frame_crc_ok,
+                         FRAME_SYNC, FRAME_HEADER_SIZE, FRAME_OVERHEAD, FRAME_CRC,
+                         FRAME_MAX_PAYLOAD)
 
 class SerialHandler:
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1.0):
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1.0,
+                 max_line_bytes: int = 4096, protocol: str = "json",
+                 timebase: Optional[Timebase] = None):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.max_line_bytes = max_line_bytes
+        self.protocol = protocol
+        self.timebase = timebase or Timebase()
+        self.received = 0.0
         self.serial_conn: Optional[serial.Serial] = None
         self.is_running = False
         self.thread: Optional[threading.Thread] = None
         self.data_callback: Optional[Callable] = None
         self.error_callback: Optional[Callable] = None
+        self.engine = None
+        self.buffer = bytearray()
+        self.discarding = False
+        self.bad_frames = 0
+        self.feed_errors = 0
+        self.zone_callbacks: Dict[int, Callable] = {}
+        self.known_zones: set = set()
+        self.misrouted_counts: Dict[int, int] = {}
+        self.unknown_counts: Dict[int, int] = {}
         
     def set_callbacks(self, data_callback: Callable = None, error_callback: Callable = None):
         self.data_callback = data_callback
         self.error_callback = error_callback
     
+    def add_zone(self, zone_id: int, data_callback: Callable):
+        # Once any zone is registered, lines are routed by their "zone" field
+        # and lines for zones not served by this port are dropped
+        self.zone_callbacks[zone_id] = data_callback
+    
+    def set_known_zones(self, zone_ids: List[int]):
+        # Zones configured anywhere in the system, to tell a line meant for
+        # another port (mis-routed) from a zone nobody configured (unknown)
+        self.known_zones = set(zone_ids)
+    
+    def get_zone_ids(self) -> List[int]:
+        return list(self.zone_callbacks)
+    
     def connect(self) -> bool:
         try:
-            self.serial_conn = serial.Serial(
-                port=self.port,
+            # URLs such as socket://host:port or loop:// go through pyserial's
+            # URL handlers (used by the simulator and for serial-over-network)
+            open_port = serial.serial_for_url if "://" in self.port else serial.Serial
+            self.serial_conn = open_port(
+                self.port,
                 baudrate=self.baudrate,
                 timeout=self.timeout,
                 write_timeout=2.0,
@@ -45,7 +79,13 @@ class SerialHandler:
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
     
+    def set_engine(self, engine):
+        self.engine = engine
+    
     def start_reading(self):
+        if self.engine:
+            return self.engine.add_handler(self)
+        
         if not self.serial_conn or not self.serial_conn.is_open:
             if not self.connect():
                 return False
@@ -56,12 +96,114 @@ class SerialHandler:
         return True
     
     def stop_reading(self):
+        if self.engine:
+            self.engine.remove_handler(self)
+            return
+        
         self.is_running = False
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2.0)
     
+    def reset_buffer(self):
+        self.buffer = bytearray()
+        self.discarding = False
+    
+    def feed(self, data: bytes, received: Optional[float] = None):
+        # Everything in one read shares the time the bytes arrived
+        self.received = self.timebase.now() if received is None else received
+        if self.protocol == "binary":
+            self._feed_frames(data)
+            return
+        
+        buffer = self.buffer
+        buffer += data
+        start = 0
+        
+        while True:
+            end = buffer.find(b'\n', start)
+            if end < 0:
+                break
+            
+            # The tail of an oversized line is skipped up to the next newline
+            if self.discarding:
+                self.discarding = False
+            elif end - start > self.max_line_bytes:
+                self.bad_frames += 1
+            else:
+                self._handle_line(buffer[start:end])
+            start = end + 1
+        
+        if start:
+            del buffer[:start]
+        
+        if len(buffer) > self.max_line_bytes:
+            self.bad_frames += 1
+            buffer.clear()
+            self.discarding = True
+    
+    def _feed_frames(self, data: bytes):
+        buffer = self.buffer
+        buffer += data
+        start = 0
+        
+        while True:
+            start = buffer.find(FRAME_SYNC, start)
+            if start < 0:
+                # Keep a trailing byte that may be the first half of a sync word
+                start = max(0, len(buffer) - 1)
+                break
+            if len(buffer) - start < FRAME_HEADER_SIZE:
+                break
+            
+            length = buffer[start + len(FRAME_SYNC)]
+            end = start + FRAME_OVERHEAD + length
+            if length <= FRAME_MAX_PAYLOAD and len(buffer) < end:
+                break
+            
+            frame = bytes(buffer[start:end])
+            if length > FRAME_MAX_PAYLOAD or not frame_crc_ok(frame):
+                # The length byte may itself be corrupt, so resync one byte on
+                # rather than skipping the length the frame claims
+                self.bad_frames += 1
+                start += 1
+                continue
+            
+            start = end
+            try:
+                sample = decode_frame_payload(frame[FRAME_HEADER_SIZE:-FRAME_CRC.size])
+            except ValueError:
+                self.bad_frames += 1
+                continue
+            self._dispatch(sample)
+        
+        if start:
+            del buffer[:start]
+    
+    def _dispatch(self, sample: Sample):
+        self.timebase.stamp(sample, self.received)
+        if self.zone_callbacks:
+            self._route(sample)
+        elif self.data_callback:
+            self.data_callback(sample)
+    
+    def _handle_line(self, frame: bytearray):
+        # Decoded per complete line, so a multibyte character split across
+        # reads is intact and a corrupt frame only costs that one line
+        if not frame or frame.isspace():
+            return
+        
+        try:
+            sample = decode_sample(frame)
+        except ValueError as e:
+            self.bad_frames += 1
+            if self.error_callback:
+                self.error_callback(str(e))
+            return
+        
+        self._dispatch(sample)
+    
     def _read_loop(self):
-        buffer = ""
+        self.reset_buffer()
         consecutive_errors = 0
         max_consecutive_errors = 5
         
@@ -69,22 +211,8 @@ class SerialHandler:
             try:
                 data = self.serial_conn.read(self.serial_conn.in_waiting or 1)
                 if data:
-                    try:
-                        decoded_data = data.decode('utf-8')
-                        buffer += decoded_data
-                        
-                        while '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                            line = line.strip()
-                            if line:
-                                self._parse_json_data(line)
-                        
-                        consecutive_errors = 0
-                        
-                    except UnicodeDecodeError:
-                        buffer = ""
-                        continue
-                        
+                    self.feed(data)
+                    consecutive_errors = 0
                 else:
                     time.sleep(0.05)
                     
@@ -104,19 +232,20 @@ class SerialHandler:
                     break
                 time.sleep(0.1)
     
-    def _parse_json_data(self, line: str):
-        try:
-            data = json.loads(line)
-            required_keys = ["zone", "temp", "hum", "mass"]
-            if all(key in data for key in required_keys):
-                if self.data_callback:
-                    self.data_callback(data)
-            else:
-                if self.error_callback:
-                    self.error_callback(f"Missing keys in data: {line}")
-        except json.JSONDecodeError as e:
-            if self.error_callback:
-                self.error_callback(f"JSON parse error: {e}")
+    def _route(self, sample: Sample):
+        zone = sample.zone
+        callback = self.zone_callbacks.get(zone)
+        if callback:
+            callback(sample)
+            return
+        
+        if zone in self.known_zones:
+            counts, reason = self.misrouted_counts, "mis-routed"
+        else:
+            counts, reason = self.unknown_counts, "unknown"
+        counts[zone] = counts.get(zone, 0) + 1
+        if counts[zone] == 1 or counts[zone] % 1000 == 0:
+            print(f"{self.port}: dropped {counts[zone]} line(s) for {reason} zone {zone}")
     
     def get_connection_status(self) -> str:
         if self.serial_conn and self.serial_conn.is_open and self.is_running:
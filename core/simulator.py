@@ -0,0 +1,300 @@
+import json
+import math
+import os
+import random
+import select
+import socket
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+from core.sample import encode_frame
+
+class ZoneModel:
+    def __init__(self, zone_id: int, rng: random.Random):
+        self.zone_id = zone_id
+        self.rng = rng
+        self.started = time.monotonic()
+        self.seq = 0
+        self.temp_setpoint = 20.0 + rng.uniform(-2.0, 2.0)
+        self.hum_setpoint = 45.0 + rng.uniform(-5.0, 5.0)
+        # Drying sample: mass decays towards an equilibrium value
+        self.start_mass = rng.uniform(800.0, 1500.0)
+        self.final_mass = self.start_mass * rng.uniform(0.6, 0.9)
+        self.time_constant = rng.uniform(600.0, 3600.0)
+
+    def next(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started
+        decay = math.exp(-elapsed / self.time_constant)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        return {
+            "zone": self.zone_id,
+            "temp": round(self.temp_setpoint + 0.3 * math.sin(elapsed / 300.0) + self.rng.gauss(0, 0.05), 2),
+            "hum": round(self.hum_setpoint + 5.0 * decay + self.rng.gauss(0, 0.2), 2),
+            "mass": round(self.final_mass + (self.start_mass - self.final_mass) * decay +
+                          self.rng.gauss(0, 0.05), 2),
+            "seq": self.seq,
+            "device_ts": round(elapsed, 3)
+        }
+
+class PtyEndpoint:
+    def __init__(self, link_path: str):
+        # A stable symlink to the current pseudo-terminal, so the HMI can
+        # reopen the same path after a simulated disconnect
+        self.path = link_path
+        self.master: Optional[int] = None
+        self.slave: Optional[int] = None
+        self.open()
+
+    def open(self):
+        import tty
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        if os.path.lexists(self.path):
+            os.remove(self.path)
+        os.symlink(os.ttyname(self.slave), self.path)
+
+    def write(self, data: bytes) -> bool:
+        if self.master is None:
+            return False
+        view = memoryview(data)
+        deadline = time.monotonic() + 0.5
+        while view:
+            try:
+                view = view[os.write(self.master, view):]
+            except BlockingIOError:
+                # Give a slow reader a moment, then drop the rest as a real
+                # UART would when nobody drains it
+                if time.monotonic() > deadline:
+                    return False
+                select.select([], [self.master], [], 0.05)
+            except OSError:
+                return False
+        return True
+
+    def drop(self):
+        for fd in (self.master, self.slave):
+            if fd is not None:
+                os.close(fd)
+        self.master = self.slave = None
+
+    def close(self):
+        self.drop()
+        if os.path.lexists(self.path):
+            os.remove(self.path)
+
+class SocketEndpoint:
+    def __init__(self, host: str, port: int):
+        self.path = f"socket://{host}:{port}"
+        self.client: Optional[socket.socket] = None
+        self.accepting = True
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(1)
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            if not self.accepting:
+                client.close()
+                continue
+            client.settimeout(0.5)
+            previous, self.client = self.client, client
+            if previous:
+                previous.close()
+
+    def open(self):
+        self.accepting = True
+
+    def write(self, data: bytes) -> bool:
+        client = self.client
+        if client is None:
+            return False
+        try:
+            client.sendall(data)
+            return True
+        except OSError:
+            self.client = None
+            client.close()
+            return False
+
+    def drop(self):
+        self.accepting = False
+        client, self.client = self.client, None
+        if client:
+            client.close()
+
+    def close(self):
+        self.drop()
+        self.server.close()
+
+class SerialSimulator:
+    def __init__(self, zone_ids: List[int], transport: str = "pty", rate_hz: float = 1.0,
+                 protocol: str = "json", multiplex: bool = False, burst_every: float = 0.0,
+                 burst_size: int = 50, malformed_rate: float = 0.0, disconnect_every: float = 0.0,
+                 downtime: float = 3.0, host: str = "127.0.0.1", base_port: int = 7000,
+                 link_dir: Optional[str] = None, seed: Optional[int] = None):
+        self.zone_ids = list(zone_ids)
+        self.rate_hz = rate_hz
+        self.protocol = protocol
+        self.burst_every = burst_every
+        self.burst_size = burst_size
+        self.malformed_rate = malformed_rate
+        self.disconnect_every = disconnect_every
+        self.downtime = downtime
+        self.rng = random.Random(seed)
+        self.models = {zone_id: ZoneModel(zone_id, self.rng) for zone_id in self.zone_ids}
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+        self.stats = {"samples": 0, "dropped": 0, "malformed": 0, "bursts": 0, "disconnects": 0}
+
+        # One endpoint per zone, or a single one carrying every zone
+        names = ["all"] if multiplex else [str(zone_id) for zone_id in self.zone_ids]
+        link_dir = link_dir or os.path.join(tempfile.gettempdir(), "hmi-sim")
+        self.endpoints = {}
+        for index, name in enumerate(names):
+            if transport == "socket":
+                self.endpoints[name] = SocketEndpoint(host, base_port + index)
+            else:
+                os.makedirs(link_dir, exist_ok=True)
+                self.endpoints[name] = PtyEndpoint(os.path.join(link_dir, f"zone_{name}"))
+        self.routes = {zone_id: self.endpoints["all" if multiplex else str(zone_id)]
+                       for zone_id in self.zone_ids}
+
+    def get_ports(self) -> Dict[int, str]:
+        return {zone_id: endpoint.path for zone_id, endpoint in self.routes.items()}
+
+    def start(self):
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        for endpoint in self.endpoints.values():
+            endpoint.close()
+
+    def _encode(self, reading: Dict[str, float]) -> bytes:
+        if self.rng.random() < self.malformed_rate:
+            self.stats["malformed"] += 1
+            return self._malformed(reading)
+        if self.protocol == "binary":
+            return encode_frame(reading["zone"], reading["temp"], reading["hum"], reading["mass"],
+                                seq=reading["seq"], device_ts=reading["device_ts"])
+        return json.dumps(reading).encode('utf-8') + b'\n'
+
+    def _malformed(self, reading: Dict[str, float]) -> bytes:
+        kind = self.rng.randrange(4)
+        if self.protocol == "binary":
+            frame = bytearray(encode_frame(reading["zone"], reading["temp"], reading["hum"],
+                                           reading["mass"], seq=reading["seq"]))
+            if kind == 0:
+                frame[self.rng.randrange(3, len(frame))] ^= 0xFF
+                return bytes(frame)
+            if kind == 1:
+                return bytes(frame[:self.rng.randrange(1, len(frame))])
+            return bytes(self.rng.getrandbits(8) for _ in range(self.rng.randrange(1, 64)))
+
+        line = json.dumps(reading)
+        if kind == 0:
+            return line[:self.rng.randrange(1, len(line))].encode('utf-8') + b'\n'
+        if kind == 1:
+            return line.replace('"temp"', '"tmp"').encode('utf-8') + b'\n'
+        if kind == 2:
+            return json.dumps(dict(reading, hum="n/a")).encode('utf-8') + b'\n'
+        return bytes(self.rng.getrandbits(8) for _ in range(self.rng.randrange(1, 64))) + b'\n'
+
+    def _emit(self, count: int = 1):
+        chunks: Dict[int, List[bytes]] = {}
+        for _ in range(count):
+            for zone_id in self.zone_ids:
+                endpoint = self.routes[zone_id]
+                chunks.setdefault(id(endpoint), []).append(self._encode(self.models[zone_id].next()))
+
+        for endpoint in self.endpoints.values():
+            data = chunks.get(id(endpoint))
+            if not data:
+                continue
+            if endpoint.write(b''.join(data)):
+                self.stats["samples"] += len(data)
+            else:
+                self.stats["dropped"] += len(data)
+
+    def _run(self):
+        period = 1.0 / self.rate_hz if self.rate_hz > 0 else 1.0
+        next_tick = time.monotonic()
+        next_burst = next_tick + self.burst_every if self.burst_every > 0 else None
+        next_disconnect = next_tick + self.disconnect_every if self.disconnect_every > 0 else None
+        reopen_at: Dict[str, float] = {}
+
+        while self.is_running:
+            now = time.monotonic()
+            if now < next_tick:
+                time.sleep(min(next_tick - now, 0.1))
+                continue
+
+            # Catch up in one batch if the loop fell behind the target rate
+            due = int((now - next_tick) / period) + 1
+            next_tick += due * period
+            self._emit(due)
+
+            if next_burst is not None and now >= next_burst:
+                self.stats["bursts"] += 1
+                self._emit(self.burst_size)
+                next_burst = now + self.burst_every
+
+            if next_disconnect is not None and now >= next_disconnect:
+                candidates = [name for name in self.endpoints if name not in reopen_at]
+                if candidates:
+                    name = self.rng.choice(candidates)
+                    self.stats["disconnects"] += 1
+                    self.endpoints[name].drop()
+                    reopen_at[name] = now + self.downtime
+                next_disconnect = now + self.disconnect_every
+
+            for name, when in list(reopen_at.items()):
+                if now >= when:
+                    self.endpoints[name].open()
+                    del reopen_at[name]
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulated climate chamber controllers")
+    parser.add_argument("--zones", type=int, default=4)
+    parser.add_argument("--transport", choices=["pty", "socket"], default="pty")
+    parser.add_argument("--protocol", choices=["json", "binary"], default="json")
+    parser.add_argument("--rate", type=float, default=1.0, help="samples per second per zone")
+    parser.add_argument("--multiplex", action="store_true", help="all zones on one port")
+    parser.add_argument("--burst-every", type=float, default=0.0)
+    parser.add_argument("--burst-size", type=int, default=50)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0)
+    parser.add_argument("--base-port", type=int, default=7000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    simulator = SerialSimulator(
+        list(range(1, args.zones + 1)), transport=args.transport, rate_hz=args.rate,
+        protocol=args.protocol, multiplex=args.multiplex, burst_every=args.burst_every,
+        burst_size=args.burst_size, malformed_rate=args.malformed_rate,
+        disconnect_every=args.disconnect_every, base_port=args.base_port, seed=args.seed
+    )
+    print(json.dumps({f"zone_{zone_id}": path for zone_id, path in simulator.get_ports().items()}, indent=4))
+    simulator.start()
+    try:
+        while True:
+            time.sleep(5)
+            print(simulator.stats)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
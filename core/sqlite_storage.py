@@ -0,0 +1,227 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional
+from core.aggregator import AGGREGATED_FIELDS
+
+SAMPLE_COLUMNS = [
+    'zone', 'ts', 'temp', 'hum', 'mass', 'calibrated_mass',
+    'temp_min', 'temp_max', 'hum_min', 'hum_max',
+    'calibrated_mass_min', 'calibrated_mass_max', 'count'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    zone INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    temp REAL,
+    hum REAL,
+    mass REAL,
+    calibrated_mass REAL,
+    temp_min REAL,
+    temp_max REAL,
+    hum_min REAL,
+    hum_max REAL,
+    calibrated_mass_min REAL,
+    calibrated_mass_max REAL,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS samples_zone_ts ON samples (zone, ts);
+"""
+
+GAP_COLUMNS = ['zone', 'ts', 'end_ts', 'missing', 'by_seq']
+
+GAP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gaps (
+    zone INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    missing INTEGER,
+    by_seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS gaps_zone_ts ON gaps (zone, ts);
+"""
+
+def connect(db_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path, timeout=10.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class SqliteStorage:
+    def __init__(self, db_path: str, flush_rows: int = 50, flush_seconds: float = 5.0):
+        self.db_path = db_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.queue: "queue.Queue" = queue.Queue()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self.writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        return connect(self.db_path)
+
+    def write(self, data: Dict[str, Any]):
+        self.queue.put(tuple(data.get(column) for column in SAMPLE_COLUMNS))
+
+    def flush(self, zone: Optional[int] = None):
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout=10.0)
+
+    def close(self):
+        self.queue.put(None)
+        self.writer_thread.join(timeout=10.0)
+
+    def _write_loop(self):
+        connection = self._connect()
+        insert = (f"INSERT INTO samples ({', '.join(SAMPLE_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' for _ in SAMPLE_COLUMNS)})")
+        pending: List[tuple] = []
+        last_commit = time.monotonic()
+        running = True
+
+        while running:
+            try:
+                item = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                item = False
+
+            waiters = []
+            if item is None:
+                running = False
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not False:
+                pending.append(item)
+
+            if pending and (not running or waiters or len(pending) >= self.flush_rows or
+                            time.monotonic() - last_commit >= self.flush_seconds):
+                try:
+                    with connection:
+                        connection.executemany(insert, pending)
+                    pending = []
+                except sqlite3.Error as e:
+                    print(f"SQLite write error: {e}")
+                last_commit = time.monotonic()
+
+            for waiter in waiters:
+                waiter.set()
+
+        connection.close()
+
+    def apply_retention(self, max_log_days: int, throttle_seconds: float = 0.0):
+        cutoff_ts = time.time() - max_log_days * 86400
+        connection = self._connect()
+        try:
+            with connection:
+                deleted = connection.execute("DELETE FROM samples WHERE ts < ?", (cutoff_ts,)).rowcount
+            if deleted:
+                print(f"Removed {deleted} expired samples from {self.db_path}")
+        finally:
+            connection.close()
+
+    def iter_range(self, zone: int, start_ts: float, end_ts: float) -> Iterator[Dict[str, float]]:
+        self.flush(zone)
+        columns = SAMPLE_COLUMNS[1:]
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                f"SELECT {', '.join(columns)} FROM samples "
+                "WHERE zone = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (zone, start_ts, end_ts)
+            )
+            for values in cursor:
+                row = {column: value for column, value in zip(columns, values) if value is not None}
+                row['timestamp'] = row.pop('ts')
+                yield row
+        finally:
+            connection.close()
+
+    def read_buckets(self, zone: int, start_ts: float, end_ts: float,
+                     bucket_seconds: float) -> Iterator[Dict[str, float]]:
+        self.flush(zone)
+        # Interval means are weighted by their sample count
+        weight = "COALESCE(count, 1)"
+        selects = ["MIN(ts)", f"SUM({weight})", f"SUM(mass * {weight}) / SUM({weight})"]
+        for field in AGGREGATED_FIELDS:
+            selects.append(f"SUM({field} * {weight}) / SUM({weight})")
+            selects.append(f"MIN(COALESCE({field}_min, {field}))")
+            selects.append(f"MAX(COALESCE({field}_max, {field}))")
+
+        columns = ['timestamp', 'count', 'mass']
+        for field in AGGREGATED_FIELDS:
+            columns.extend([field, f'{field}_min', f'{field}_max'])
+
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                f"SELECT {', '.join(selects)} FROM samples "
+                "WHERE zone = ? AND ts >= ? AND ts < ? "
+                "GROUP BY CAST(ts / ? AS INTEGER) ORDER BY 1",
+                (zone, start_ts, end_ts, bucket_seconds)
+            )
+            for values in cursor:
+                yield {column: value for column, value in zip(columns, values) if value is not None}
+        finally:
+            connection.close()
+
+class SqliteGapStorage:
+    # Gap records in the same database as the samples they describe. Gaps are
+    # rare, so each one is committed as it is written
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        connection = connect(db_path)
+        connection.executescript(GAP_SCHEMA)
+        connection.close()
+
+    def write(self, data: Dict[str, Any]):
+        connection = connect(self.db_path)
+        try:
+            with connection:
+                connection.execute(
+                    f"INSERT INTO gaps ({', '.join(GAP_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in GAP_COLUMNS)})",
+                    tuple(data.get(column) for column in GAP_COLUMNS)
+                )
+        except sqlite3.Error as e:
+            print(f"SQLite gap write error: {e}")
+        finally:
+            connection.close()
+
+    def iter_range(self, zone: int, start_ts: float, end_ts: float) -> Iterator[Dict[str, float]]:
+        columns = GAP_COLUMNS[1:]
+        connection = connect(self.db_path)
+        try:
+            cursor = connection.execute(
+                f"SELECT {', '.join(columns)} FROM gaps "
+                "WHERE zone = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (zone, start_ts, end_ts)
+            )
+            for values in cursor:
+                row = {column: value for column, value in zip(columns, values) if value is not None}
+                row['timestamp'] = row.pop('ts')
+                yield row
+        finally:
+            connection.close()
+
+    def apply_retention(self, max_log_days: int, throttle_seconds: float = 0.0):
+        cutoff_ts = time.time() - max_log_days * 86400
+        connection = connect(self.db_path)
+        try:
+            with connection:
+                connection.execute("DELETE FROM gaps WHERE end_ts < ?", (cutoff_ts,))
+        finally:
+            connection.close()
+
+    def close(self):
+        pass
@@ -0,0 +1,45 @@
+import threading
+import time
+from typing import Dict, Optional
+from core.sample import Sample
+
+class Timebase:
+    def __init__(self, max_skew_seconds: float = 2.0):
+        # Wall time is read once; every later stamp advances with the
+        # monotonic clock, so NTP steps and DST never reorder samples
+        self.anchor = time.time() - time.monotonic()
+        self.max_skew_seconds = max_skew_seconds
+        self.device_offsets: Dict[int, float] = {}
+        self.last_stamps: Dict[int, float] = {}
+        self.lock = threading.Lock()
+
+    def now(self) -> float:
+        return self.anchor + time.monotonic()
+
+    def stamp(self, sample: Sample, received: Optional[float] = None):
+        if received is None:
+            received = self.now()
+        zone = sample.zone
+
+        with self.lock:
+            ts = received
+            if sample.device_ts is not None:
+                # Transport delay only ever adds to receive - device, so the
+                # smallest offset seen is the closest to the true one. A jump
+                # beyond the skew limit means the device clock was reset.
+                candidate = received - sample.device_ts
+                offset = self.device_offsets.get(zone)
+                if offset is None or abs(candidate - offset) > self.max_skew_seconds:
+                    offset = candidate
+                else:
+                    offset = min(offset, candidate)
+                self.device_offsets[zone] = offset
+                ts = sample.device_ts + offset
+
+            # Keep each zone's stream ordered for bisecting window lookups
+            last = self.last_stamps.get(zone)
+            if last is not None and ts < last:
+                ts = last
+            self.last_stamps[zone] = ts
+
+        sample.ts = ts
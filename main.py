@@ -1,31 +1,70 @@
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
 import customtkinter as ctk
 import threading
-import time
 from typing import Dict, Any
 from config.settings import Settings
 from core.serial_handler import SerialHandler
+from core.serial_engine import SerialEngine
+from core.sample import Sample
+from core.timebase import Timebase
 from core.data_manager import DataManager
 from ui.overview_page import OverviewPage
-from ui.zone_detail_page import ZoneDetailPage
-from ui.settings_window import SettingsWindow
+from ui.update_scheduler import UiUpdateScheduler, configure_if_changed
 
 class ClimateHMI:
     def __init__(self):
         self.settings = Settings()
-        self.data_manager = DataManager(self.settings)
+        self.zone_ids = self.settings.get_zone_ids()
+        self.timebase = Timebase()
+        self.data_manager = DataManager(self.settings, timebase=self.timebase)
         self.serial_handlers = {}
         self.current_data = {}
         self.auto_reconnect = True
+        self.is_shut_down = False
+        self.port_handlers = {}
+        self.port_zones = {}
         self.reconnect_attempts = {}
         self.max_reconnect_attempts = 5
-        
-        for zone_id in range(1, 5):
-            self.reconnect_attempts[zone_id] = 0
+        self.serial_engine = None
+        if self.settings.get_serial_config()["engine"] == "selector":
+            self.serial_engine = SerialEngine()
+            self.serial_engine.set_status_callback(self.on_engine_status)
+            self.serial_engine.start()
+        
+        self.simulator = None
+        self.simulator_ports = {}
+        self.ui_latency = {"count": 0, "total": 0.0, "max": 0.0}
+        self.chart_samples = {}
+        self.chart_samples_lock = threading.Lock()
+        simulator_config = self.settings.get_simulator_config()
+        if simulator_config["enabled"]:
+            self.start_simulator(simulator_config)
         
         self.setup_ui()
+        self.data_manager.set_equilibrium_callback(self.on_equilibrium_changed)
         self.setup_serial_connections()
         self.start_equilibrium_check()
-        self.start_auto_reconnect()
+        if self.serial_engine:
+            # The engine reconnects lost ports itself on backoff timers
+            self.root.after(5000, self.poll_connection_status)
+        else:
+            self.start_auto_reconnect()
+        self.root.after_idle(self.report_startup_time)
+        self.stats_report_ms = int(self.settings.get_ui_config()["stats_report_seconds"] * 1000)
+        self.stats_mark = (time.perf_counter(), 0)
+        if self.stats_report_ms > 0:
+            self.root.after(self.stats_report_ms, self.report_link_stats)
+        
+    def report_startup_time(self):
+        elapsed = time.perf_counter() - STARTUP_STARTED
+        budget = self.settings.get_ui_config()["startup_budget_seconds"]
+        if elapsed <= budget:
+            print(f"Startup completed in {elapsed:.2f}s (budget {budget:.1f}s)")
+        else:
+            print(f"Startup completed in {elapsed:.2f}s, over the {budget:.1f}s budget")
         
     def setup_ui(self):
         ctk.set_appearance_mode("light")
@@ -33,8 +72,10 @@ class ClimateHMI:
         
         self.root = ctk.CTk()
         self.root.title("Climate Chamber HMI")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_exit)
         
-        ui_config = self.settings.config["ui"]
+        ui_config = self.settings.get_ui_config()
+        self.ui_scheduler = UiUpdateScheduler(self.root, max_rate_hz=ui_config["max_update_hz"])
         if ui_config["fullscreen"]:
             self.root.attributes('-fullscreen', True)
         else:
@@ -48,14 +89,16 @@ class ClimateHMI:
         main_frame.grid_columnconfigure(0, weight=1)
         main_frame.grid_rowconfigure(0, weight=1)
         
-        self.tabview = ctk.CTkTabview(main_frame, height=ui_config["height"]-100)
+        self.tabview = ctk.CTkTabview(main_frame, height=ui_config["height"]-100,
+                                      command=self.on_tab_changed)
         self.tabview.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         
         self.overview_tab = self.tabview.add("Overview")
-        self.zone1_tab = self.tabview.add("Zone 1")
-        self.zone2_tab = self.tabview.add("Zone 2")
-        self.zone3_tab = self.tabview.add("Zone 3")
-        self.zone4_tab = self.tabview.add("Zone 4")
+        self.zone_tabs = {}
+        self.zone_tab_names = {}
+        for zone_id in self.zone_ids:
+            self.zone_tabs[zone_id] = self.tabview.add(f"Zone {zone_id}")
+            self.zone_tab_names[f"Zone {zone_id}"] = zone_id
         self.settings_tab = self.tabview.add("Settings")
         
         self.setup_overview_page()
@@ -83,23 +126,64 @@ class ClimateHMI:
         self.exit_button.grid(row=0, column=1, padx=10, pady=10)
     
     def setup_overview_page(self):
-        self.overview_page = OverviewPage(self.overview_tab)
+        self.overview_page = OverviewPage(self.overview_tab, zone_ids=self.zone_ids)
         self.overview_page.pack(fill="both", expand=True, padx=10, pady=10)
     
     def setup_zone_pages(self):
+        # Detail pages (and matplotlib with them) are built on first visit
         self.zone_pages = {}
-        tabs = [self.zone1_tab, self.zone2_tab, self.zone3_tab, self.zone4_tab]
-        
-        for i, tab in enumerate(tabs):
-            zone_id = i + 1
-            zone_page = ZoneDetailPage(tab, zone_id=zone_id)
-            zone_page.pack(fill="both", expand=True, padx=10, pady=10)
-            zone_page.set_callbacks(
-                tare_callback=lambda zid=zone_id: self.on_tare(zid),
-                zero_callback=lambda zid=zone_id: self.on_zero(zid)
-            )
-            zone_page.set_data_manager(self.data_manager)
-            self.zone_pages[zone_id] = zone_page
+    
+    def on_tab_changed(self):
+        zone_id = self.zone_tab_names.get(self.tabview.get())
+        if zone_id is not None and zone_id not in self.zone_pages:
+            self.build_zone_page(zone_id)
+    
+    def build_zone_page(self, zone_id: int):
+        from ui.zone_detail_page import ZoneDetailPage
+        
+        zone_page = ZoneDetailPage(self.zone_tabs[zone_id], zone_id=zone_id)
+        zone_page.pack(fill="both", expand=True, padx=10, pady=10)
+        zone_page.set_callbacks(
+            tare_callback=lambda zid=zone_id: self.on_tare(zid),
+            zero_callback=lambda zid=zone_id: self.on_zero(zid)
+        )
+        self.zone_pages[zone_id] = zone_page
+        
+        handler = self.serial_handlers.get(zone_id)
+        zone_page.set_connection_status(bool(handler) and handler.get_connection_status() == "Connected")
+        if zone_id in self.current_data:
+            zone_page.update_data(self.current_data[zone_id])
+        if zone_id in self.data_manager.equilibrium_states:
+            zone_page.update_equilibrium_status(self.data_manager.equilibrium_states[zone_id])
+        
+        self.root.after_idle(lambda: zone_page.set_data_manager(self.data_manager))
+    
+    def apply_zone_data(self, zone_id: int, sample: Sample):
+        # Receive-to-display latency, including the update scheduler's delay
+        latency = self.timebase.now() - sample.ts
+        self.ui_latency["count"] += 1
+        self.ui_latency["total"] += latency
+        self.ui_latency["max"] = max(self.ui_latency["max"], latency)
+        
+        self.overview_page.update_zone_data(zone_id, sample)
+        if zone_id in self.zone_pages:
+            self.zone_pages[zone_id].update_data(sample)
+    
+    def apply_chart_samples(self, zone_id: int):
+        with self.chart_samples_lock:
+            samples = self.chart_samples.pop(zone_id, [])
+        if samples and zone_id in self.zone_pages:
+            self.zone_pages[zone_id].append_chart_samples(samples)
+    
+    def apply_zone_equilibrium(self, zone_id: int, is_equilibrated: bool):
+        self.overview_page.update_zone_equilibrium(zone_id, is_equilibrated)
+        if zone_id in self.zone_pages:
+            self.zone_pages[zone_id].update_equilibrium_status(is_equilibrated)
+    
+    def apply_zone_connection_status(self, zone_id: int, connected: bool):
+        self.overview_page.set_zone_connection_status(zone_id, connected)
+        if zone_id in self.zone_pages:
+            self.zone_pages[zone_id].set_connection_status(connected)
     
     def setup_settings_page(self):
         settings_frame = ctk.CTkScrollableFrame(self.settings_tab)
@@ -127,13 +211,14 @@ class ClimateHMI:
         
         self.port_vars = {}
         self.port_dropdowns = {}
+        self.protocol_vars = {}
         
         import serial.tools.list_ports
         available_ports = [port.device for port in serial.tools.list_ports.comports()]
         if not available_ports:
             available_ports = ["No ports found"]
         
-        for zone_id in range(1, 5):
+        for zone_id in self.zone_ids:
             zone_frame = ctk.CTkFrame(serial_frame)
             zone_frame.pack(fill="x", padx=10, pady=5)
             
@@ -155,6 +240,17 @@ class ClimateHMI:
             )
             self.port_dropdowns[zone_id].pack(side="left", padx=10, pady=10)
             
+            self.protocol_vars[zone_id] = ctk.StringVar(
+                value=self.settings.get_serial_protocol(self.settings.get_serial_port(zone_id))
+            )
+            
+            ctk.CTkComboBox(
+                zone_frame,
+                variable=self.protocol_vars[zone_id],
+                values=["json", "binary"],
+                width=120
+            ).pack(side="left", padx=10, pady=10)
+            
         button_frame = ctk.CTkFrame(serial_frame)
         button_frame.pack(fill="x", padx=10, pady=10)
         
@@ -184,7 +280,7 @@ class ClimateHMI:
         
         self.cal_entries = {}
         
-        for zone_id in range(1, 5):
+        for zone_id in self.zone_ids:
             zone_cal_frame = ctk.CTkFrame(cal_frame)
             zone_cal_frame.pack(fill="x", padx=10, pady=5)
             
@@ -228,71 +324,126 @@ class ClimateHMI:
             command=self.apply_calibration_settings
         ).pack(pady=10)
     
+    def start_simulator(self, simulator_config: Dict[str, Any]):
+        from core.simulator import SerialSimulator
+        
+        self.simulator = SerialSimulator(
+            self.zone_ids,
+            transport=simulator_config["transport"],
+            rate_hz=simulator_config["rate_hz"],
+            protocol=simulator_config["protocol"],
+            multiplex=simulator_config["multiplex"],
+            burst_every=simulator_config["burst_every"],
+            burst_size=simulator_config["burst_size"],
+            malformed_rate=simulator_config["malformed_rate"],
+            disconnect_every=simulator_config["disconnect_every"],
+            base_port=simulator_config["base_port"]
+        )
+        # Simulated endpoints replace the configured ports for this run only
+        self.simulator_ports = self.simulator.get_ports()
+        self.simulator.start()
+        print(f"Simulator running: {self.simulator_ports}")
+    
+    def get_zone_port(self, zone_id: int) -> str:
+        return self.simulator_ports.get(zone_id) or self.settings.get_serial_port(zone_id)
+    
+    def get_port_protocol(self, port: str) -> str:
+        if self.simulator and port in self.simulator_ports.values():
+            return self.simulator.protocol
+        return self.settings.get_serial_protocol(port)
+    
     def setup_serial_connections(self):
-        for zone_id in range(1, 5):
-            port = self.settings.get_serial_port(zone_id)
-            serial_config = self.settings.config["serial"]
-            
+        # Zones configured on the same port share one multiplexed handler that
+        # demultiplexes lines by their "zone" field
+        self.port_zones = {}
+        for zone_id in self.zone_ids:
+            self.port_zones.setdefault(self.get_zone_port(zone_id), []).append(zone_id)
+        
+        serial_config = self.settings.get_serial_config()
+        self.port_handlers = {}
+        for port, zone_ids in self.port_zones.items():
             handler = SerialHandler(
                 port=port,
                 baudrate=serial_config["baudrate"],
-                timeout=serial_config["timeout"]
-            )
-            
-            handler.set_callbacks(
-                data_callback=lambda data, zid=zone_id: self.on_data_received(data, zid),
-                error_callback=lambda msg, zid=zone_id: self.on_serial_error(msg, zid)
+                timeout=serial_config["timeout"],
+                max_line_bytes=serial_config["max_line_bytes"],
+                protocol=self.get_port_protocol(port),
+                timebase=self.timebase
             )
             
-            self.serial_handlers[zone_id] = handler
+            handler.set_callbacks(error_callback=lambda msg, p=port: self.on_serial_error(msg, p))
+            handler.set_known_zones(self.zone_ids)
+            for zone_id in zone_ids:
+                handler.add_zone(zone_id, lambda data, zid=zone_id: self.on_data_received(data, zid))
+                self.serial_handlers[zone_id] = handler
+            self.port_handlers[port] = handler
+            self.reconnect_attempts.setdefault(port, 0)
             
-            if handler.start_reading():
-                print(f"Zone {zone_id} connected on {port}")
+            zone_names = ", ".join(str(zone_id) for zone_id in zone_ids)
+            if self.serial_engine:
+                handler.set_engine(self.serial_engine)
+                handler.start_reading()
+                print(f"Zone {zone_names} opening {port}")
+            elif handler.start_reading():
+                print(f"Zone {zone_names} connected on {port}")
             else:
-                print(f"Zone {zone_id} failed to connect on {port}")
+                print(f"Zone {zone_names} failed to connect on {port}")
         
         self.update_connection_status()
     
-    def on_data_received(self, raw_data: Dict[str, Any], zone_id: int):
-        processed_data = self.data_manager.process_sensor_data(raw_data)
-        self.current_data[zone_id] = processed_data
+    def on_data_received(self, sample: Sample, zone_id: int):
+        sample = self.data_manager.process_sensor_data(sample)
+        self.current_data[zone_id] = sample
         
-        self.root.after(0, lambda: self.overview_page.update_zone_data(zone_id, processed_data))
-        self.root.after(0, lambda: self.zone_pages[zone_id].update_data(processed_data))
+        self.ui_scheduler.post(("data", zone_id), lambda: self.apply_zone_data(zone_id, sample))
         
-        self.data_manager.log_data(processed_data)
-    
-    def on_serial_error(self, error_msg: str, zone_id: int):
-        print(f"Zone {zone_id} serial error: {error_msg}")
+        # Labels only need the latest snapshot, but the chart must plot every
+        # sample, so those are queued and handed over in one batch per tick
+        if zone_id in self.zone_pages:
+            with self.chart_samples_lock:
+                self.chart_samples.setdefault(zone_id, []).append(sample)
+            self.ui_scheduler.post(("chart", zone_id), lambda: self.apply_chart_samples(zone_id))
         
-        self.root.after(0, lambda: self.overview_page.set_zone_connection_status(zone_id, False))
-        self.root.after(0, lambda: self.zone_pages[zone_id].set_connection_status(False))
+        self.data_manager.log_data(sample)
+    
+    def on_serial_error(self, error_msg: str, port: str):
+        for zone_id in self.port_zones.get(port, []):
+            print(f"Zone {zone_id} serial error: {error_msg}")
+            
+            self.ui_scheduler.post(("connection", zone_id), lambda zid=zone_id:
+                                   self.apply_zone_connection_status(zid, False))
         
         if "connection lost" in error_msg.lower() or "clearcommerror" in error_msg.lower():
-            self.reconnect_attempts[zone_id] = 0
+            self.reconnect_attempts[port] = 0
     
     def on_tare(self, zone_id: int):
-        if zone_id in self.current_data and "calibrated_mass" in self.current_data[zone_id]:
-            current_mass = self.current_data[zone_id]["calibrated_mass"]
+        if zone_id in self.current_data:
+            current_mass = self.current_data[zone_id].calibrated_mass
             self.data_manager.tare_mass(zone_id, current_mass)
             print(f"Tared zone {zone_id} at {current_mass:.2f}g")
     
     def on_zero(self, zone_id: int):
-        if zone_id in self.current_data and "mass" in self.current_data[zone_id]:
-            raw_mass = self.current_data[zone_id]["mass"]
+        if zone_id in self.current_data:
+            raw_mass = self.current_data[zone_id].mass
             self.data_manager.zero_mass(zone_id, raw_mass)
             print(f"Zeroed zone {zone_id} at raw value {raw_mass}")
     
     def start_equilibrium_check(self):
+        # State flips are pushed from the detectors as samples arrive; this loop
+        # only expires stale windows for zones that have stopped reporting
+        if self.serial_engine:
+            def expire_equilibrium():
+                for zone_id in self.zone_ids:
+                    self.data_manager.is_mass_equilibrated(zone_id)
+            
+            self.serial_engine.call_repeating(30, expire_equilibrium)
+            return
+        
         def check_equilibrium():
             while True:
                 try:
-                    for zone_id in range(1, 5):
-                        is_equilibrated = self.data_manager.is_mass_equilibrated(zone_id)
-                        self.root.after(0, lambda zid=zone_id, eq=is_equilibrated: 
-                                       self.overview_page.update_zone_equilibrium(zid, eq))
-                        self.root.after(0, lambda zid=zone_id, eq=is_equilibrated: 
-                                       self.zone_pages[zid].update_equilibrium_status(eq))
+                    for zone_id in self.zone_ids:
+                        self.data_manager.is_mass_equilibrated(zone_id)
                     time.sleep(30)
                 except Exception as e:
                     print(f"Equilibrium check error: {e}")
@@ -301,30 +452,31 @@ class ClimateHMI:
         eq_thread = threading.Thread(target=check_equilibrium, daemon=True)
         eq_thread.start()
     
+    def on_equilibrium_changed(self, zone_id: int, is_equilibrated: bool):
+        self.ui_scheduler.post(("equilibrium", zone_id),
+                               lambda: self.apply_zone_equilibrium(zone_id, is_equilibrated))
+    
     def start_auto_reconnect(self):
         def auto_reconnect_loop():
             while self.auto_reconnect:
                 try:
-                    for zone_id in range(1, 5):
-                        handler = self.serial_handlers.get(zone_id)
-                        if (handler and 
-                            handler.get_connection_status() == "Disconnected" and
-                            self.reconnect_attempts[zone_id] < self.max_reconnect_attempts):
+                    for port, handler in list(self.port_handlers.items()):
+                        if (handler.get_connection_status() == "Disconnected" and
+                            self.reconnect_attempts[port] < self.max_reconnect_attempts):
                             
-                            self.reconnect_attempts[zone_id] += 1
-                            print(f"Zone {zone_id} auto-reconnect attempt {self.reconnect_attempts[zone_id]}")
+                            self.reconnect_attempts[port] += 1
+                            print(f"{port} auto-reconnect attempt {self.reconnect_attempts[port]}")
                             
                             handler.disconnect()
                             time.sleep(2)
                             
                             if handler.start_reading():
-                                self.reconnect_attempts[zone_id] = 0
-                                print(f"Zone {zone_id} auto-reconnect successful")
+                                self.reconnect_attempts[port] = 0
+                                print(f"{port} auto-reconnect successful")
                                 
-                                self.root.after(0, lambda zid=zone_id: 
-                                               self.overview_page.set_zone_connection_status(zid, True))
-                                self.root.after(0, lambda zid=zone_id: 
-                                               self.zone_pages[zid].set_connection_status(True))
+                                for zone_id in self.port_zones[port]:
+                                    self.ui_scheduler.post(("connection", zone_id), lambda zid=zone_id: 
+                                                           self.apply_zone_connection_status(zid, True))
                     
                     self.update_connection_status()
                     time.sleep(5)
@@ -336,9 +488,60 @@ class ClimateHMI:
         reconnect_thread = threading.Thread(target=auto_reconnect_loop, daemon=True)
         reconnect_thread.start()
     
+    def on_engine_status(self, handler: SerialHandler, connected: bool):
+        for zone_id in handler.get_zone_ids():
+            self.ui_scheduler.post(("connection", zone_id), lambda zid=zone_id:
+                                   self.apply_zone_connection_status(zid, connected))
+        self.update_connection_status()
+    
+    def get_link_stats(self) -> Dict[str, Any]:
+        # Sample accounting per zone and framing errors per port, for monitoring
+        zones = self.data_manager.get_gap_stats()
+        received = sum(zone["received"] for zone in zones.values())
+        uptime = time.perf_counter() - STARTUP_STARTED
+        return {
+            "zones": zones,
+            "ingest": {"samples": received, "seconds": uptime, "rate": received / uptime},
+            "ui_latency": dict(self.ui_latency),
+            "ports": {
+                port: {
+                    "zones": handler.get_zone_ids(),
+                    "bad_frames": handler.bad_frames,
+                    "feed_errors": handler.feed_errors,
+                    "misrouted": dict(handler.misrouted_counts),
+                    "unknown": dict(handler.unknown_counts)
+                }
+                for port, handler in list(self.port_handlers.items())
+            }
+        }
+    
+    def report_link_stats(self):
+        stats = self.get_link_stats()
+        now, received = time.perf_counter(), stats["ingest"]["samples"]
+        last_time, last_received = self.stats_mark
+        self.stats_mark = (now, received)
+        print(self.describe_link_stats(stats, (received - last_received) / (now - last_time)))
+        self.root.after(self.stats_report_ms, self.report_link_stats)
+    
+    @staticmethod
+    def describe_link_stats(stats: Dict[str, Any], rate: float) -> str:
+        latency = stats["ui_latency"]
+        average = latency["total"] / latency["count"] if latency["count"] else 0.0
+        zones = stats["zones"].values()
+        ports = stats["ports"].values()
+        return (f"Link stats: {stats['ingest']['samples']} samples ({rate:.1f}/s), "
+                f"UI latency avg {average * 1000:.0f} ms / max {latency['max'] * 1000:.0f} ms, "
+                f"{sum(zone['missed'] for zone in zones)} missed in {sum(zone['gaps'] for zone in zones)} gaps, "
+                f"{sum(port['bad_frames'] for port in ports)} bad frames, "
+                f"{sum(port['feed_errors'] for port in ports)} feed errors")
+    
+    def poll_connection_status(self):
+        self.update_connection_status()
+        self.root.after(5000, self.poll_connection_status)
+    
     def update_connection_status(self):
         connected_zones = []
-        for zone_id in range(1, 5):
+        for zone_id in self.zone_ids:
             handler = self.serial_handlers.get(zone_id)
             if handler and handler.get_connection_status() == "Connected":
                 connected_zones.append(str(zone_id))
@@ -350,26 +553,27 @@ class ClimateHMI:
             status = "No zones connected"
             color = "red"
             
-        self.root.after(0, lambda: self.connection_status_label.configure(
-            text=status, text_color=color
+        self.ui_scheduler.post("connection_summary", lambda: configure_if_changed(
+            self.connection_status_label, text=status, text_color=color
         ))
     
     def apply_serial_settings(self):
-        for zone_id in range(1, 5):
+        for zone_id in self.zone_ids:
             port = self.port_vars[zone_id].get()
             if port and port != "No ports found":
                 self.settings.update_serial_port(zone_id, port)
+                self.settings.update_serial_protocol(port, self.protocol_vars[zone_id].get())
         
-        for zone_id in range(1, 5):
-            if zone_id in self.serial_handlers:
-                self.serial_handlers[zone_id].disconnect()
+        for handler in self.port_handlers.values():
+            handler.disconnect()
+        self.serial_handlers = {}
         
         self.setup_serial_connections()
         print("Serial settings applied and connections restarted")
     
     def apply_calibration_settings(self):
         try:
-            for zone_id in range(1, 5):
+            for zone_id in self.zone_ids:
                 entries = self.cal_entries[zone_id]
                 offset = float(entries["offset"].get())
                 scale = float(entries["scale"].get())
@@ -390,17 +594,38 @@ class ClimateHMI:
         if not available_ports:
             available_ports = ["No ports found"]
         
-        for zone_id in range(1, 5):
+        for zone_id in self.zone_ids:
             self.port_dropdowns[zone_id].configure(values=available_ports)
     
     def on_exit(self):
+        self.shutdown()
+        self.root.quit()
+    
+    def shutdown(self):
+        # Buffered log rows and open aggregation buckets only reach disk in
+        # DataManager.close(), so every way out of the app comes through here
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
         self.auto_reconnect = False
-        for handler in self.serial_handlers.values():
+        for handler in self.port_handlers.values():
             handler.disconnect()
-        self.root.quit()
+        if self.serial_engine:
+            self.serial_engine.stop()
+        if self.simulator:
+            print(f"Simulator stats: {self.simulator.stats}")
+            self.simulator.stop()
+        stats = self.get_link_stats()
+        print(self.describe_link_stats(stats, stats["ingest"]["rate"]))
+        self.data_manager.close()
     
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
 
 if __name__ == "__main__":
     app = ClimateHMI()
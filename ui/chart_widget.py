@@ -2,10 +2,20 @@ import customtkinter as ctk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import matplotlib.dates as mdates
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+import threading
+from core.sample import Sample
+from .decimation import minmax_decimate, insert_gap_breaks, fold_buckets
+
+LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+def to_date_num(timestamps):
+    # Matplotlib date numbers are days since the Unix epoch (UTC); local
+    # time is applied by the tz-aware locators and formatters
+    return timestamps / 86400.0
 
 class ChartWidget(ctk.CTkFrame):
     def __init__(self, parent, zone_id: int, **kwargs):
@@ -13,6 +23,9 @@ class ChartWidget(ctk.CTkFrame):
         
         self.zone_id = zone_id
         self.data_manager = None
+        self.load_generation = 0
+        self.chart_data = None
+        self.last_spacing = 0.0
         
         self.setup_ui()
         self.setup_chart()
@@ -34,7 +47,7 @@ class ChartWidget(ctk.CTkFrame):
             control_frame,
             text="Temperature",
             variable=self.temp_var,
-            command=self.update_chart,
+            command=self.redraw_chart,
             font=ctk.CTkFont(size=12)
         )
         self.temp_check.grid(row=0, column=1, padx=10, pady=10)
@@ -44,7 +57,7 @@ class ChartWidget(ctk.CTkFrame):
             control_frame,
             text="Humidity",
             variable=self.hum_var,
-            command=self.update_chart,
+            command=self.redraw_chart,
             font=ctk.CTkFont(size=12)
         )
         self.hum_check.grid(row=0, column=2, padx=10, pady=10)
@@ -54,11 +67,14 @@ class ChartWidget(ctk.CTkFrame):
             control_frame,
             text="Mass",
             variable=self.mass_var,
-            command=self.update_chart,
+            command=self.redraw_chart,
             font=ctk.CTkFont(size=12)
         )
         self.mass_check.grid(row=0, column=3, padx=10, pady=10)
         
+        self.loading_label = ctk.CTkLabel(control_frame, text="", font=ctk.CTkFont(size=12))
+        self.loading_label.grid(row=0, column=4, padx=10, pady=10)
+        
         ctk.CTkLabel(control_frame, text="Time:", font=ctk.CTkFont(size=14)).grid(
             row=0, column=5, padx=(20, 10), pady=10
         )
@@ -67,7 +83,7 @@ class ChartWidget(ctk.CTkFrame):
         self.time_dropdown = ctk.CTkComboBox(
             control_frame,
             variable=self.time_var,
-            values=["30 Minutes", "1 Hour", "6 Hours", "12 Hours", "24 Hours"],
+            values=["30 Minutes", "1 Hour", "6 Hours", "12 Hours", "24 Hours", "7 Days", "30 Days"],
             command=self.on_time_change,
             width=120
         )
@@ -91,24 +107,43 @@ class ChartWidget(ctk.CTkFrame):
         self.figure.patch.set_facecolor('#212121')
         
         self.ax1 = self.figure.add_subplot(111)
-        self.ax1.set_facecolor('#2b2b2b')
-        self.ax1.tick_params(colors='white')
-        self.ax1.spines['bottom'].set_color('white')
-        self.ax1.spines['top'].set_color('white')
-        self.ax1.spines['right'].set_color('white')
-        self.ax1.spines['left'].set_color('white')
-        
         self.ax2 = self.ax1.twinx()
-        self.ax2.tick_params(colors='white')
         
         self.canvas = FigureCanvasTkAgg(self.figure, self.chart_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=5, pady=5)
         
-        self.ax1.set_xlabel('Time', color='white')
-        self.ax1.set_ylabel('Temperature (°C) / Humidity (%)', color='white')
-        self.ax2.set_ylabel('Mass (g)', color='white')
+        # Persistent artists: data lines are animated so live samples can be
+        # blitted over a cached background instead of redrawing the figure
+        self.temp_line, = self.ax1.plot([], [], color='red', linewidth=2,
+                                        label='Temperature (°C)', animated=True)
+        self.hum_line, = self.ax1.plot([], [], color='blue', linewidth=2,
+                                       label='Humidity (%)', animated=True)
+        self.mass_line, = self.ax2.plot([], [], color='green', linewidth=2,
+                                        label='Mass (g)', animated=True)
+        self.series = {
+            'temp': (self.temp_line, self.temp_var),
+            'hum': (self.hum_line, self.hum_var),
+            'calibrated_mass': (self.mass_line, self.mass_var)
+        }
+        self.message_text = self.ax1.text(0.5, 0.5, '', 
+                                          horizontalalignment='center', verticalalignment='center',
+                                          transform=self.ax1.transAxes, color='white', fontsize=14)
+        self.legend = None
+        
+        self.xs = np.empty(0)
+        self.ys = {key: np.empty(0) for key in self.series}
+        self.pending_samples = []
+        self.open_samples = []
+        self.open_points = 0
+        self.background = None
+        self.live_job = None
+        self.axis_hours = None
+        self.decimated_width = 0
+        self.updating_limits = False
         
-        self.ax1.grid(True, alpha=0.3, color='gray')
+        self.setup_chart_style()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.ax1.callbacks.connect('xlim_changed', self._on_xlim_changed)
         self.figure.tight_layout()
         
     def set_data_manager(self, data_manager):
@@ -121,7 +156,9 @@ class ChartWidget(ctk.CTkFrame):
             "1 Hour": 1,
             "6 Hours": 6,
             "12 Hours": 12,
-            "24 Hours": 24
+            "24 Hours": 24,
+            "7 Days": 24 * 7,
+            "30 Days": 24 * 30
         }
         return time_map.get(self.time_var.get(), 1)
         
@@ -131,75 +168,254 @@ class ChartWidget(ctk.CTkFrame):
     def update_chart(self):
         if not self.data_manager:
             return
-            
+        
+        # A newer request supersedes any load still in flight
+        self.load_generation += 1
+        generation = self.load_generation
         hours = self.get_time_hours()
-        data = self.data_manager.get_recent_data(self.zone_id, hours)
-        
-        if not data:
-            self.ax1.clear()
-            self.ax2.clear()
-            self.ax1.text(0.5, 0.5, 'No data available', 
-                         horizontalalignment='center', verticalalignment='center',
-                         transform=self.ax1.transAxes, color='white', fontsize=14)
-            self.setup_chart_style()
-            self.canvas.draw()
-            return
-            
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['temp'] = pd.to_numeric(df['temp'], errors='coerce')
-        df['hum'] = pd.to_numeric(df['hum'], errors='coerce')
-        df['calibrated_mass'] = pd.to_numeric(df['calibrated_mass'], errors='coerce')
-        
-        df = df.dropna()
-        
-        if df.empty:
-            self.ax1.clear()
-            self.ax2.clear()
-            self.ax1.text(0.5, 0.5, 'No valid data', 
-                         horizontalalignment='center', verticalalignment='center',
-                         transform=self.ax1.transAxes, color='white', fontsize=14)
-            self.setup_chart_style()
-            self.canvas.draw()
-            return
-            
-        self.ax1.clear()
-        self.ax2.clear()
+        self.loading_label.configure(text="Loading...")
+        
+        thread = threading.Thread(target=self._load_chart_data, args=(generation, hours), daemon=True)
+        thread.start()
+        
+    def _load_chart_data(self, generation: int, hours: float):
+        try:
+            result = self._prepare_chart_data(hours)
+        except Exception as e:
+            print(f"Error loading chart data: {e}")
+            result = None
+        
+        if generation == self.load_generation:
+            self.after(0, lambda: self._on_chart_data_loaded(generation, result))
+        
+    def _prepare_chart_data(self, hours: float):
+        series = self.data_manager.get_recent_series(self.zone_id, hours)
+        if not len(series['timestamp']):
+            return {'message': 'No data available'}
+        
+        keys = ['timestamp'] + list(self.series)
+        valid = np.logical_and.reduce([np.isfinite(series[key]) for key in keys])
+        if not valid.any():
+            return {'message': 'No valid data'}
+        
+        # The line breaks where the gap records say samples went missing,
+        # the same gaps the link statistics count
+        timestamps = series['timestamp'][valid]
+        gaps = self.data_manager.get_gaps(self.zone_id, datetime.fromtimestamp(timestamps[0]),
+                                          datetime.fromtimestamp(self.data_manager.timebase.now() + 1))
+        spacing = to_date_num(series['spacing'][valid])
+        
+        timestamps, values = insert_gap_breaks(
+            to_date_num(timestamps), {key: series[key][valid] for key in self.series},
+            *self._gap_bounds(gaps), spacing
+        )
+        return dict(values, timestamp=timestamps, spacing=spacing[-1])
         
-        lines = []
-        labels = []
+    @staticmethod
+    def _gap_bounds(gaps: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        return (to_date_num(np.array([gap['timestamp'] for gap in gaps], dtype=float)),
+                to_date_num(np.array([gap['end_ts'] for gap in gaps], dtype=float)))
         
-        if self.temp_var.get():
-            line1 = self.ax1.plot(df['timestamp'], df['temp'], 
-                                 color='red', linewidth=2, label='Temperature (°C)')
-            lines.extend(line1)
-            labels.append('Temperature (°C)')
-            
-        if self.hum_var.get():
-            line2 = self.ax1.plot(df['timestamp'], df['hum'], 
-                                 color='blue', linewidth=2, label='Humidity (%)')
-            lines.extend(line2)
-            labels.append('Humidity (%)')
-            
-        if self.mass_var.get():
-            line3 = self.ax2.plot(df['timestamp'], df['calibrated_mass'], 
-                                 color='green', linewidth=2, label='Mass (g)')
-            lines.extend(line3)
-            labels.append('Mass (g)')
-            
-        self.setup_chart_style()
+    def _on_chart_data_loaded(self, generation: int, result):
+        if generation != self.load_generation:
+            return
+        self.loading_label.configure(text="")
+        self.chart_data = result
+        self.pending_samples = []
+        self.open_samples = []
+        self.open_points = 0
+        self.render_chart(result)
+        
+    def redraw_chart(self):
+        if self.chart_data is None:
+            self.update_chart()
+            return
+        for line, var in self.series.values():
+            line.set_visible(var.get())
+        self._update_legend()
+        self._fit_limits(force=True)
+        self._update_lines()
+        self._relayout()
+        
+    def render_chart(self, result):
+        if result is None or 'message' in result:
+            self.message_text.set_text(result['message'] if result else 'Error loading data')
+            self.xs = np.empty(0)
+            self.ys = {key: np.empty(0) for key in self.series}
+        else:
+            self.message_text.set_text('')
+            self.xs = np.asarray(result['timestamp'], dtype=float)
+            self.ys = {key: np.asarray(result[key], dtype=float) for key in self.series}
+            self.last_spacing = result['spacing']
+        
+        for line, var in self.series.values():
+            line.set_visible(var.get())
+        self._update_legend()
+        self._fit_limits(force=True)
+        self._update_lines()
+        self._relayout()
+        
+    def append_samples(self, samples: List[Sample]):
+        if self.chart_data is None:
+            return
+        self.pending_samples.extend(samples)
+        if self.live_job is None:
+            self.live_job = self.after(1000, self._apply_pending_samples)
+        
+    def _live_step(self) -> float:
+        # Live samples are folded to the resolution the view is drawn at, so
+        # a chart left open for days still adds a bounded number of points
+        return to_date_num(self.get_time_hours() * 3600 / max(int(self.ax1.bbox.width), 50))
+        
+    def _apply_pending_samples(self):
+        self.live_job = None
+        if not self.pending_samples:
+            return
         
+        # The last slot is still filling: its points are redrawn from its
+        # samples every tick until the next slot starts
+        samples = self.open_samples + self.pending_samples
+        self.pending_samples = []
+        if self.open_points:
+            self.xs = self.xs[:-self.open_points]
+            self.ys = {key: self.ys[key][:-self.open_points] for key in self.series}
+        
+        step = self._live_step()
+        new_xs = to_date_num(np.array([sample.ts for sample in samples]))
+        new_ys = {key: np.array([getattr(sample, key) for sample in samples])
+                  for key in self.series}
+        open_start = np.floor_divide(new_xs[-1], step) * step
+        self.open_samples = samples[np.searchsorted(new_xs, open_start, side='left'):]
+        new_xs, new_ys = fold_buckets(new_xs, new_ys, step)
+        
+        # Gaps recorded since the last point drawn, the join to it included
+        head = self.xs[-1:]
+        gaps = self.data_manager.get_recent_gaps(self.zone_id, (head if len(head) else new_xs)[0] * 86400.0)
+        new_xs, new_ys = insert_gap_breaks(
+            np.concatenate([head, new_xs]),
+            {key: np.concatenate([np.full(len(head), np.nan), new_ys[key]]) for key in self.series},
+            *self._gap_bounds(gaps),
+            np.concatenate([np.full(len(head), self.last_spacing), np.full(len(new_xs), step)])
+        )
+        new_xs = new_xs[len(head):]
+        new_ys = {key: new_ys[key][len(head):] for key in self.series}
+        self.last_spacing = step
+        self.open_points = len(new_xs) - np.searchsorted(new_xs, open_start, side='left')
+        
+        cutoff = to_date_num(self.data_manager.timebase.now() - self.get_time_hours() * 3600)
+        first = np.searchsorted(self.xs, cutoff, side='left')
+        self.xs = np.concatenate([self.xs[first:], new_xs])
+        self.ys = {key: np.concatenate([self.ys[key][first:], new_ys[key]]) for key in self.series}
+        relayout = bool(self.message_text.get_text())
+        self.message_text.set_text('')
+        
+        if not self.winfo_ismapped():
+            self._update_lines()
+            return
+        if self._fit_limits(values=new_ys) or relayout or self.background is None:
+            self._update_lines()
+            self._relayout()
+        else:
+            self._update_lines()
+            self._blit()
+        
+    def _update_lines(self):
+        # Only the visible span is plotted, reduced to ~2 points per pixel
+        # column of the axes; re-run whenever the x limits or size change
+        xmin, xmax = self.ax1.get_xlim()
+        first = max(np.searchsorted(self.xs, xmin, side='left') - 1, 0)
+        last = np.searchsorted(self.xs, xmax, side='right') + 1
+        max_points = max(int(self.ax1.bbox.width) * 2, 100)
+        self.decimated_width = int(self.ax1.bbox.width)
+        
+        for key, (line, _) in self.series.items():
+            line.set_data(*minmax_decimate(self.xs[first:last], self.ys[key][first:last], max_points))
+        
+    def _on_xlim_changed(self, axis):
+        if not self.updating_limits:
+            self._update_lines()
+        
+    def _fit_limits(self, force: bool = False, values: Optional[Dict[str, np.ndarray]] = None) -> bool:
+        self.updating_limits = True
+        try:
+            return self._apply_limits(force, values if values is not None else self.ys)
+        finally:
+            self.updating_limits = False
+        
+    def _apply_limits(self, force: bool, ys: Dict[str, np.ndarray]) -> bool:
+        changed = False
+        hours = self.get_time_hours()
+        window = hours / 24.0
+        now = to_date_num(self.data_manager.timebase.now())
+        
+        xmin, xmax = self.ax1.get_xlim()
+        if force or now > xmax:
+            # Leave headroom on the right so live samples fit for a while
+            self.ax1.set_xlim(now - window, now + window * 0.05)
+            changed = True
+        
+        for axis, keys in ((self.ax1, ('temp', 'hum')), (self.ax2, ('calibrated_mass',))):
+            # Limits only ever widen between full refits, so live ticks
+            # check just the new points
+            values = [ys[key] for key in keys
+                      if self.series[key][1].get() and len(ys[key])]
+            if not values:
+                continue
+            values = np.concatenate(values)
+            values = values[np.isfinite(values)]
+            if not len(values):
+                continue
+            low, high = values.min(), values.max()
+            ymin, ymax = axis.get_ylim()
+            if force or low < ymin or high > ymax:
+                margin = max((high - low) * 0.1, 0.5)
+                axis.set_ylim(low - margin, high + margin)
+                changed = True
+        
+        if self.axis_hours != hours:
+            self.axis_hours = hours
+            self._set_time_axis(hours)
+            changed = True
+        return changed
+        
+    def _update_legend(self):
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+        lines = [line for line, var in self.series.values() if var.get()]
         if lines:
-            self.ax1.legend(lines, labels, loc='upper left', 
-                           facecolor='#2b2b2b', edgecolor='white', 
-                           labelcolor='white')
+            self.legend = self.ax1.legend(lines, [line.get_label() for line in lines], loc='upper left', 
+                                          facecolor='#2b2b2b', edgecolor='white', 
+                                          labelcolor='white')
         
+    def _relayout(self):
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
+        
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+        if int(self.ax1.bbox.width) != self.decimated_width and len(self.xs):
+            self.after_idle(self._on_resize)
+        
+    def _on_resize(self):
+        self._update_lines()
+        self.canvas.draw_idle()
+        
+    def _draw_lines(self):
+        for line, var in self.series.values():
+            if var.get():
+                line.axes.draw_artist(line)
+        
+    def _blit(self):
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+        self.canvas.blit(self.figure.bbox)
         
     def setup_chart_style(self):
         self.ax1.set_facecolor('#2b2b2b')
         self.ax1.tick_params(colors='white')
+        self.ax1.tick_params(axis='x', labelrotation=45)
         self.ax1.spines['bottom'].set_color('white')
         self.ax1.spines['top'].set_color('white')
         self.ax1.spines['right'].set_color('white')
@@ -216,12 +432,13 @@ class ChartWidget(ctk.CTkFrame):
         
         self.ax1.grid(True, alpha=0.3, color='gray')
         
-        import matplotlib.dates as mdates
-        self.ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        self.ax1.xaxis.set_major_locator(mdates.HourLocator(interval=1))
-        
-        for label in self.ax1.get_xticklabels():
-            label.set_rotation(45)
+    def _set_time_axis(self, hours: float):
+        if hours > 24:
+            self.ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m %H:%M', tz=LOCAL_TZ))
+            self.ax1.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=12, tz=LOCAL_TZ))
+        else:
+            self.ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M', tz=LOCAL_TZ))
+            self.ax1.xaxis.set_major_locator(mdates.HourLocator(interval=1, tz=LOCAL_TZ))
             
     def refresh_data(self):
         self.update_chart()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+from typing import Dict, Tuple, Union
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    count = len(x)
+    if count <= max_points or max_points < 4:
+        return x, y
+
+    # Keep the minimum and maximum of every bucket, in time order, so spikes
+    # and excursions survive however many points fall into one pixel column
+    buckets = max_points // 2
+    per_bucket = count // buckets
+    used = per_bucket * buckets
+
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    offsets = np.arange(buckets) * per_bucket
+    min_index = low[:used].reshape(buckets, per_bucket).argmin(axis=1) + offsets
+    max_index = high[:used].reshape(buckets, per_bucket).argmax(axis=1) + offsets
+    indices = [min_index, max_index]
+
+    if used < count:
+        indices.append(np.array([used + low[used:].argmin(), used + high[used:].argmax()]))
+
+    # Gap markers are NaN; keep the first of each NaN run so breaks in the
+    # line survive decimation
+    missing = np.isnan(y)
+    if missing.any():
+        indices.append(np.flatnonzero(missing & ~np.concatenate(([False], missing[:-1]))))
+
+    keep = np.unique(np.concatenate(indices))
+    return x[keep], y[keep]
+
+def fold_buckets(x: np.ndarray, ys: Dict[str, np.ndarray],
+                 bucket: float) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    # Reduce time-ordered points to the ones holding the minimum or maximum
+    # of any series within each bucket-wide slot, the extremes
+    # minmax_decimate would keep on screen anyway
+    if len(x) < 2 or bucket <= 0:
+        return x, ys
+    keys = np.floor_divide(x, bucket)
+    starts = np.flatnonzero(np.diff(keys, prepend=np.nan) != 0)
+    if len(starts) == len(x):
+        return x, ys
+
+    indices = []
+    for y in ys.values():
+        low = np.where(np.isnan(y), np.inf, y)
+        high = np.where(np.isnan(y), -np.inf, y)
+        indices.append(np.lexsort((low, keys))[starts])
+        indices.append(np.lexsort((-high, keys))[starts])
+
+    keep = np.unique(np.concatenate(indices))
+    return x[keep], {key: y[keep] for key, y in ys.items()}
+
+def insert_gap_breaks(x: np.ndarray, ys: Dict[str, np.ndarray], starts: np.ndarray, ends: np.ndarray,
+                      spacing: Union[float, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    # A NaN point between the two points either side of every recorded gap
+    # stops matplotlib from drawing a line across it. A gap shorter than the
+    # spacing of the points there (one value, or one per point) cannot show
+    if len(x) < 2 or not len(starts):
+        return x, ys
+    positions = np.searchsorted(x, starts, side='right')
+    inside = (positions > 0) & (positions < len(x))
+    positions, spans = positions[inside], (ends - starts)[inside]
+    positions = np.unique(positions[spans >= np.broadcast_to(spacing, x.shape)[positions - 1]])
+    if not len(positions):
+        return x, ys
+
+    midpoints = (x[positions - 1] + x[positions]) / 2
+    return (np.insert(x, positions, midpoints),
+            {key: np.insert(y, positions, np.nan) for key, y in ys.items()})
@@ -1,5 +1,8 @@
+import math
 import customtkinter as ctk
-from typing import Dict, Any, Callable
+from typing import List
+from core.sample import Sample
+from .update_scheduler import configure_if_changed
 
 class ZoneCard(ctk.CTkFrame):
     def __init__(self, parent, zone_id: int, **kwargs):
@@ -75,48 +78,56 @@ class ZoneCard(ctk.CTkFrame):
         )
         self.equilibrium_label.grid(row=3, column=0, pady=(0, 10))
         
-    def update_data(self, data: Dict[str, Any]):
-        temp = data.get("temp", 0)
-        hum = data.get("hum", 0)
-        mass = data.get("calibrated_mass", 0)
+    def update_data(self, sample: Sample):
+        temp = sample.temp
+        hum = sample.hum
+        mass = sample.calibrated_mass
         
-        self.temp_label.configure(text=f"{temp:.1f}°C")
-        self.hum_label.configure(text=f"{hum:.1f}%")
-        self.mass_label.configure(text=f"{mass:.2f}g")
+        configure_if_changed(self.temp_label, text=f"{temp:.1f}°C")
+        configure_if_changed(self.hum_label, text=f"{hum:.1f}%")
+        configure_if_changed(self.mass_label, text=f"{mass:.2f}g")
         
-        self.status_label.configure(text="Status: Active", text_color="green")
+        configure_if_changed(self.status_label, text="Status: Active", text_color="green")
         
     def update_equilibrium_status(self, is_equilibrated: bool):
         if is_equilibrated:
-            self.equilibrium_label.configure(
+            configure_if_changed(
+                self.equilibrium_label,
                 text="Equilibrium: ✓ Stable",
                 text_color="green"
             )
         else:
-            self.equilibrium_label.configure(
+            configure_if_changed(
+                self.equilibrium_label,
                 text="Equilibrium: ⧗ Stabilizing",
                 text_color="orange"
             )
             
     def set_connection_status(self, connected: bool):
         if connected:
-            self.status_label.configure(text="Status: Connected", text_color="green")
+            configure_if_changed(self.status_label, text="Status: Connected", text_color="green")
         else:
-            self.status_label.configure(text="Status: Disconnected", text_color="red")
+            configure_if_changed(self.status_label, text="Status: Disconnected", text_color="red")
 
 class OverviewPage(ctk.CTkFrame):
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, zone_ids: List[int], **kwargs):
         super().__init__(parent, **kwargs)
         
+        self.zone_ids = list(zone_ids)
         self.zone_cards = {}
         self.setup_ui()
         
     def setup_ui(self):
-        self.grid_columnconfigure((0, 1), weight=1)
-        self.grid_rowconfigure((0, 1), weight=1)
+        # Near-square grid: 2x2 for four zones, 3x3 for eight, 4x4 for sixteen
+        columns = max(1, math.ceil(math.sqrt(len(self.zone_ids))))
+        rows = max(1, math.ceil(len(self.zone_ids) / columns))
+        padding = 20 if columns <= 2 else 8
+        
+        self.grid_columnconfigure(tuple(range(columns)), weight=1)
+        self.grid_rowconfigure(tuple(range(1, rows + 1)), weight=1)
         
         title_frame = ctk.CTkFrame(self)
-        title_frame.grid(row=0, column=0, columnspan=2, padx=20, pady=20, sticky="ew")
+        title_frame.grid(row=0, column=0, columnspan=columns, padx=20, pady=20, sticky="ew")
         
         title_label = ctk.CTkLabel(
             title_frame,
@@ -125,18 +136,18 @@ class OverviewPage(ctk.CTkFrame):
         )
         title_label.pack(pady=20)
         
-        for zone_id in range(1, 5):
-            row = 1 + (zone_id - 1) // 2
-            col = (zone_id - 1) % 2
+        for index, zone_id in enumerate(self.zone_ids):
+            row = 1 + index // columns
+            col = index % columns
             
             zone_card = ZoneCard(self, zone_id=zone_id)
-            zone_card.grid(row=row, column=col, padx=20, pady=20, sticky="nsew")
+            zone_card.grid(row=row, column=col, padx=padding, pady=padding, sticky="nsew")
             
             self.zone_cards[zone_id] = zone_card
             
-    def update_zone_data(self, zone_id: int, data: Dict[str, Any]):
+    def update_zone_data(self, zone_id: int, sample: Sample):
         if zone_id in self.zone_cards:
-            self.zone_cards[zone_id].update_data(data)
+            self.zone_cards[zone_id].update_data(sample)
             
     def update_zone_equilibrium(self, zone_id: int, is_equilibrated: bool):
         if zone_id in self.zone_cards:
@@ -0,0 +1,39 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+def configure_if_changed(widget, **kwargs):
+    # Tk reconfigures (and re-lays out) a label even when nothing changed
+    last_config = getattr(widget, "_last_config", {})
+    changed = {key: value for key, value in kwargs.items() if last_config.get(key) != value}
+    if changed:
+        widget.configure(**changed)
+        last_config.update(changed)
+        widget._last_config = last_config
+
+class UiUpdateScheduler:
+    def __init__(self, root, max_rate_hz: float = 5.0):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / max_rate_hz))
+        self.pending: Dict[Hashable, Callable[[], Any]] = {}
+        self.lock = threading.Lock()
+        self.scheduled = False
+
+    def post(self, key: Hashable, update: Callable[[], Any]):
+        # Only the latest update per key survives until the next tick
+        with self.lock:
+            self.pending[key] = update
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.root.after(self.interval_ms, self._apply_pending)
+
+    def _apply_pending(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.scheduled = False
+
+        for update in pending.values():
+            try:
+                update()
+            except Exception as e:
+                print(f"UI update error: {e}")
@@ -1,5 +1,6 @@
 import customtkinter as ctk
-from typing import Dict, Any, Callable
+from typing import Callable, List
+from core.sample import Sample
 from .zone_widget import ZoneWidget
 from .chart_widget import ChartWidget
 
@@ -45,8 +46,11 @@ class ZoneDetailPage(ctk.CTkFrame):
         self.data_manager = data_manager
         self.chart_widget.set_data_manager(data_manager)
         
-    def update_data(self, data: Dict[str, Any]):
-        self.zone_widget.update_data(data)
+    def update_data(self, sample: Sample):
+        self.zone_widget.update_data(sample)
+        
+    def append_chart_samples(self, samples: List[Sample]):
+        self.chart_widget.append_samples(samples)
         
     def update_equilibrium_status(self, is_equilibrated: bool):
         self.zone_widget.update_equilibrium_status(is_equilibrated)
@@ -1,5 +1,7 @@
 import customtkinter as ctk
-from typing import Dict, Any, Callable
+from typing import Callable
+from core.sample import Sample
+from .update_scheduler import configure_if_changed
 
 class ZoneWidget(ctk.CTkFrame):
     def __init__(self, parent, zone_id: int, **kwargs):
@@ -90,34 +92,36 @@ class ZoneWidget(ctk.CTkFrame):
         self.tare_callback = tare_callback
         self.zero_callback = zero_callback
     
-    def update_data(self, data: Dict[str, Any]):
-        temp = data.get("temp", 0)
-        hum = data.get("hum", 0)
-        mass = data.get("calibrated_mass", 0)
+    def update_data(self, sample: Sample):
+        temp = sample.temp
+        hum = sample.hum
+        mass = sample.calibrated_mass
         
-        self.temp_label.configure(text=f"Temperature\n{temp:.1f}°C")
-        self.hum_label.configure(text=f"Humidity\n{hum:.1f}%")
-        self.mass_label.configure(text=f"Mass\n{mass:.2f}g")
+        configure_if_changed(self.temp_label, text=f"Temperature\n{temp:.1f}°C")
+        configure_if_changed(self.hum_label, text=f"Humidity\n{hum:.1f}%")
+        configure_if_changed(self.mass_label, text=f"Mass\n{mass:.2f}g")
         
-        self.status_label.configure(text="Status: Active", text_color="green")
+        configure_if_changed(self.status_label, text="Status: Active", text_color="green")
     
     def update_equilibrium_status(self, is_equilibrated: bool):
         if is_equilibrated:
-            self.equilibrium_label.configure(
+            configure_if_changed(
+                self.equilibrium_label,
                 text="Equilibrium: ✓ Stable",
                 text_color="green"
             )
         else:
-            self.equilibrium_label.configure(
+            configure_if_changed(
+                self.equilibrium_label,
                 text="Equilibrium: ⧗ Stabilizing",
                 text_color="orange"
             )
     
     def set_connection_status(self, connected: bool):
         if connected:
-            self.status_label.configure(text="Status: Connected", text_color="green")
+            configure_if_changed(self.status_label, text="Status: Connected", text_color="green")
         else:
-            self.status_label.configure(text="Status: Disconnected", text_color="red")
+            configure_if_changed(self.status_label, text="Status: Disconnected", text_color="red")
     
     def _on_tare(self):
         if self.tare_callback: